@@ -0,0 +1,38 @@
+# Generated by Django 5.2.6 on 2026-10-15 22:32
+
+from django.conf import settings
+from django.db import migrations, models
+from performance.operations import AddIndexConcurrently
+
+
+class Migration(migrations.Migration):
+
+    atomic = False
+
+    dependencies = [
+        ('analytics', '0001_initial'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        AddIndexConcurrently(
+            model_name='studentanalytics',
+            index=models.Index(fields=['improvement_trend'], name='analytics_trend_idx'),
+        ),
+        AddIndexConcurrently(
+            model_name='studentanalytics',
+            index=models.Index(fields=['submission_rate'], name='analytics_submission_idx'),
+        ),
+        AddIndexConcurrently(
+            model_name='studentflag',
+            index=models.Index(fields=['student', 'is_resolved'], name='flag_student_resolved_idx'),
+        ),
+        AddIndexConcurrently(
+            model_name='studentflag',
+            index=models.Index(fields=['severity', 'is_resolved'], name='flag_severity_resolved_idx'),
+        ),
+        AddIndexConcurrently(
+            model_name='studentflag',
+            index=models.Index(fields=['created_at'], name='flag_created_at_idx'),
+        ),
+    ]
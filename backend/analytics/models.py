@@ -49,6 +49,11 @@ class StudentFlag(models.Model):
     class Meta:
         ordering = ['-created_at']
         unique_together = ['student', 'flag_type', 'is_resolved']
+        indexes = [
+            models.Index(fields=['student', 'is_resolved'], name='flag_student_resolved_idx'),  # Student flag queries
+            models.Index(fields=['severity', 'is_resolved'], name='flag_severity_resolved_idx'),  # Priority flag queries
+            models.Index(fields=['created_at'], name='flag_created_at_idx'),  # Recent flag queries
+        ]
     
     def __str__(self):
         return f"{self.student.get_full_name()} - {self.get_flag_type_display()} ({self.severity})"
@@ -103,6 +108,12 @@ class StudentAnalytics(models.Model):
     
     last_updated = models.DateTimeField(auto_now=True)
     
+    class Meta:
+        indexes = [
+            models.Index(fields=['improvement_trend'], name='analytics_trend_idx'),  # Trend analysis
+            models.Index(fields=['submission_rate'], name='analytics_submission_idx'),  # Performance queries
+        ]
+    
     def __str__(self):
         return f"Analytics for {self.student.get_full_name()}"
     
@@ -35,7 +35,7 @@ def generate_class_performance_report(class_id, format='csv'):
         # Get recent recordings
         recent_recordings = Recording.objects.filter(
             student=student,
-            status='reviewed'
+            status=Recording.Status.REVIEWED
         ).order_by('-created_at')[:5]
         
         # Calculate recent performance
@@ -89,7 +89,7 @@ def generate_student_progress_report(student_id, format='csv'):
             'story_title': recording.story.title if recording.story else 'Unknown',
             'assignment_title': recording.assignment.title if recording.assignment else 'Practice',
             'duration_seconds': recording.duration,
-            'status': recording.status,
+            'status': recording.status_slug,
             'fluency_score': recording.fluency_score or 'Not scored',
             'accuracy_score': recording.accuracy_score or 'Not scored',
             'grade': recording.grade or 'Not graded',
@@ -190,7 +190,7 @@ def generate_school_wide_report(format='csv'):
     # Assignment and recording statistics
     total_assignments = Assignment.objects.count()
     total_recordings = Recording.objects.count()
-    reviewed_recordings = Recording.objects.filter(status='reviewed').count()
+    reviewed_recordings = Recording.objects.filter(status=Recording.Status.REVIEWED).count()
     
     # Performance statistics
     overall_completion_rate = StudentAnalytics.objects.aggregate(
@@ -272,7 +272,7 @@ def generate_gradebook_export(class_id, format='csv'):
             recording = Recording.objects.filter(
                 student=student,
                 assignment=assignment,
-                status='reviewed'
+                status=Recording.Status.REVIEWED
             ).first()
             
             if recording:
@@ -62,7 +62,7 @@ def analyze_student(student):
             avg=Avg('duration')
         )['avg'] or 0
         
-        reviewed_recordings = recordings.filter(status='reviewed')
+        reviewed_recordings = recordings.filter(status=Recording.Status.REVIEWED)
         if reviewed_recordings.exists():
             analytics.avg_fluency_score = reviewed_recordings.aggregate(
                 avg=Avg('fluency_score')
@@ -98,8 +98,8 @@ def analyze_student(student):
     
     # Determine improvement trend
     if analytics.total_recordings >= 3:
-        recent_recordings = recordings.filter(status='reviewed').order_by('-created_at')[:3]
-        older_recordings = recordings.filter(status='reviewed').order_by('-created_at')[3:6]
+        recent_recordings = recordings.filter(status=Recording.Status.REVIEWED).order_by('-created_at')[:3]
+        older_recordings = recordings.filter(status=Recording.Status.REVIEWED).order_by('-created_at')[3:6]
         
         if recent_recordings.count() >= 2 and older_recordings.count() >= 2:
             recent_avg = recent_recordings.aggregate(
@@ -234,7 +234,7 @@ def update_system_analytics():
     # Content metrics
     analytics.total_assignments_created = Assignment.objects.count()
     analytics.total_recordings_submitted = Recording.objects.count()
-    analytics.total_recordings_reviewed = Recording.objects.filter(status='reviewed').count()
+    analytics.total_recordings_reviewed = Recording.objects.filter(status=Recording.Status.REVIEWED).count()
     
     # Calculate storage usage (simplified)
     total_recordings = Recording.objects.aggregate(
@@ -0,0 +1,32 @@
+# Generated by Django 5.2.6 on 2026-10-15 22:32
+
+from django.conf import settings
+from django.db import migrations, models
+from performance.operations import AddIndexConcurrently
+
+
+class Migration(migrations.Migration):
+
+    atomic = False
+
+    dependencies = [
+        ('assignments', '0003_assignment_class_assigned'),
+        ('authentication', '0002_class_classmembership_class_students_and_more'),
+        ('stories', '0001_initial'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        AddIndexConcurrently(
+            model_name='assignment',
+            index=models.Index(fields=['teacher', 'is_active'], name='assign_teacher_active_idx'),
+        ),
+        AddIndexConcurrently(
+            model_name='assignment',
+            index=models.Index(fields=['class_assigned', 'is_active'], name='assign_class_active_idx'),
+        ),
+        AddIndexConcurrently(
+            model_name='assignment',
+            index=models.Index(fields=['due_date'], name='assign_due_date_idx'),
+        ),
+    ]
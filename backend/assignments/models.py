@@ -44,9 +44,22 @@ class Assignment(models.Model):
     
     class Meta:
         ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['teacher', 'is_active'], name='assign_teacher_active_idx'),  # Teacher assignment queries
+            models.Index(fields=['class_assigned', 'is_active'], name='assign_class_active_idx'),  # Class assignment queries
+            models.Index(fields=['due_date'], name='assign_due_date_idx'),  # Deadline queries
+        ]
     
     def __str__(self):
         return f"{self.title} - {self.teacher.username}"
+    
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # Lets signal handlers spot an assignment moved to another teacher
+        if 'teacher_id' in instance.__dict__:
+            instance._loaded_teacher_id = instance.teacher_id
+        return instance
 
 
 class StudentAssignment(models.Model):
@@ -152,8 +152,8 @@ def assignment_progress(request, assignment_id):
         from recordings.models import Recording
         recordings = Recording.objects.filter(assignment=assignment)
         total_recordings = recordings.count()
-        reviewed_recordings = recordings.filter(status='reviewed').count()
-        pending_review = recordings.filter(status='pending').count()
+        reviewed_recordings = recordings.filter(status=Recording.Status.REVIEWED).count()
+        pending_review = recordings.filter(status=Recording.Status.PENDING).count()
         
         return Response({
             'assignment': AssignmentSerializer(assignment).data,
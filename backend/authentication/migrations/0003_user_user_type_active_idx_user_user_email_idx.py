@@ -0,0 +1,25 @@
+# Generated by Django 5.2.6 on 2026-10-15 22:32
+
+from django.db import migrations, models
+from performance.operations import AddIndexConcurrently
+
+
+class Migration(migrations.Migration):
+
+    atomic = False
+
+    dependencies = [
+        ('auth', '0012_alter_user_first_name_max_length'),
+        ('authentication', '0002_class_classmembership_class_students_and_more'),
+    ]
+
+    operations = [
+        AddIndexConcurrently(
+            model_name='user',
+            index=models.Index(fields=['user_type', 'is_active'], name='user_type_active_idx'),
+        ),
+        AddIndexConcurrently(
+            model_name='user',
+            index=models.Index(fields=['email'], name='user_email_idx'),
+        ),
+    ]
@@ -33,6 +33,12 @@ class User(AbstractUser):
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
     
+    class Meta(AbstractUser.Meta):
+        indexes = [
+            models.Index(fields=['user_type', 'is_active'], name='user_type_active_idx'),  # Filtering users by type and status
+            models.Index(fields=['email'], name='user_email_idx'),  # Login lookups
+        ]
+    
     def __str__(self):
         return f"{self.username} ({self.get_user_type_display()})"
     
@@ -11,6 +11,7 @@ from .serializers import (
 )
 from security.serializers import SecureLoginSerializer, SecureRegistrationSerializer
 from security.validators import validate_api_input
+from security.middleware import get_client_ip
 import logging
 
 logger = logging.getLogger('security')
@@ -25,7 +26,7 @@ class RegisterView(generics.CreateAPIView):
     def create(self, request, *args, **kwargs):
         """Enhanced registration with security logging"""
         # Log registration attempt
-        client_ip = self.get_client_ip(request)
+        client_ip = get_client_ip(request)
         logger.info(f"Registration attempt from IP {client_ip}")
         
         serializer = self.get_serializer(data=request.data)
@@ -56,15 +57,6 @@ class RegisterView(generics.CreateAPIView):
         # Log failed registration
         logger.warning(f"Failed registration attempt from IP {client_ip}: {serializer.errors}")
         return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
-    
-    def get_client_ip(self, request):
-        """Get client IP address"""
-        x_forwarded_for = request.META.get('HTTP_X_FORWARDED_FOR')
-        if x_forwarded_for:
-            ip = x_forwarded_for.split(',')[0]
-        else:
-            ip = request.META.get('REMOTE_ADDR')
-        return ip
 
 
 @api_view(['POST'])
@@ -100,16 +92,6 @@ def login_view(request):
     return Response(serializer.errors, status=status.HTTP_401_UNAUTHORIZED)
 
 
-def get_client_ip(request):
-    """Utility function to get client IP"""
-    x_forwarded_for = request.META.get('HTTP_X_FORWARDED_FOR')
-    if x_forwarded_for:
-        ip = x_forwarded_for.split(',')[0]
-    else:
-        ip = request.META.get('REMOTE_ADDR')
-    return ip
-
-
 @api_view(['POST'])
 @permission_classes([permissions.IsAuthenticated])
 def logout_view(request):
@@ -56,9 +56,7 @@ def create_sample_data():
         defaults={
             'content': 'Once upon a time, there was a cat who wore a red hat. The cat loved to play in the garden.',
             'grade_level': '1',
-            'difficulty': 'easy',
-            'word_count': 20,
-            'estimated_reading_time': 30
+            'difficulty': 'easy'
         }
     )
     if created:
@@ -69,9 +67,7 @@ def create_sample_data():
         defaults={
             'content': 'In the forest stood a magical tree that granted wishes to kind children who visited it.',
             'grade_level': '2',
-            'difficulty': 'medium',
-            'word_count': 15,
-            'estimated_reading_time': 25
+            'difficulty': 'medium'
         }
     )
     if created:
@@ -10,12 +10,31 @@ from django.views.decorators.csrf import csrf_exempt
 from rest_framework.decorators import api_view, permission_classes
 from rest_framework.permissions import AllowAny
 from rest_framework.response import Response
+from performance.optimizations import cache_result
 import time
 import logging
 
 logger = logging.getLogger(__name__)
 
 
+@cache_result(timeout=60, key_prefix='health')
+def _application_counts():
+    """
+    Row counts reported by the detailed health check. The endpoint is
+    public and polled by monitoring, so the full-table counts are cached
+    rather than run on every probe.
+    """
+    from authentication.models import User
+    from stories.models import Story
+    from recordings.models import Recording
+    
+    return {
+        'total_users': User.objects.count(),
+        'total_stories': Story.objects.count(),
+        'total_recordings': Recording.objects.count(),
+    }
+
+
 @csrf_exempt
 @require_http_methods(["GET"])
 def health_check(request):
@@ -146,20 +165,10 @@ def detailed_health_check(request):
     
     # Application-specific health checks
     try:
-        from authentication.models import User
-        from stories.models import Story
-        from recordings.models import Recording
-        
         # Check if core models are accessible
-        user_count = User.objects.count()
-        story_count = Story.objects.count()
-        recording_count = Recording.objects.count()
-        
         health_status['checks']['models'] = 'healthy'
         health_status['metrics']['application'] = {
-            'total_users': user_count,
-            'total_stories': story_count,
-            'total_recordings': recording_count,
+            **_application_counts(),
             'models_accessible': True
         }
         
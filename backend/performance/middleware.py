@@ -7,6 +7,7 @@ import logging
 from django.utils.deprecation import MiddlewareMixin
 from django.core.cache import cache
 from django.conf import settings
+from security.middleware import get_client_ip
 import json
 
 logger = logging.getLogger(__name__)
@@ -143,7 +144,7 @@ class RateLimitMiddleware(MiddlewareMixin):
             return None
         
         # Get client IP
-        client_ip = self.get_client_ip(request)
+        client_ip = get_client_ip(request)
         
         # Check rate limit (100 requests per minute per IP)
         rate_limit_key = f"rate_limit_{client_ip}"
@@ -160,12 +161,3 @@ class RateLimitMiddleware(MiddlewareMixin):
         cache.set(rate_limit_key, current_requests + 1, 60)  # 1 minute window
         
         return None
-    
-    def get_client_ip(self, request):
-        """Get client IP address"""
-        x_forwarded_for = request.META.get('HTTP_X_FORWARDED_FOR')
-        if x_forwarded_for:
-            ip = x_forwarded_for.split(',')[0]
-        else:
-            ip = request.META.get('REMOTE_ADDR')
-        return ip
\ No newline at end of file
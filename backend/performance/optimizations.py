@@ -2,32 +2,92 @@
 Database and query optimizations for the reading platform
 """
 
-from django.db import models
+from django.db import connection, models
 from django.core.cache import cache
 from django.db.models import Prefetch, Count, Avg
+from collections import OrderedDict
+from contextlib import contextmanager
 from functools import wraps
 import hashlib
 import json
+import math
+import threading
+import time
+import uuid
+
+# Backends where recordings migration 0004 installs the stats counter triggers
+RECORDING_COUNTER_VENDORS = ('postgresql', 'sqlite')
+
+
+class LocalTTLCache:
+    """
+    Small in-process LRU cache whose entries expire after a fixed TTL.
+    Used as an L1 in front of the shared cache backend for hot keys.
+    """
+    
+    def __init__(self, maxsize=1024, ttl=5):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+    
+    def get(self, key, default=None):
+        with self._lock:
+            item = self._data.get(key)
+            if item is None:
+                return default
+            value, expires_at = item
+            if expires_at <= time.monotonic():
+                del self._data[key]
+                return default
+            self._data.move_to_end(key)
+            return value
+    
+    def set(self, key, value, ttl=None):
+        expires_at = time.monotonic() + (self.ttl if ttl is None else ttl)
+        with self._lock:
+            self._data[key] = (value, expires_at)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+    
+    def delete(self, key):
+        with self._lock:
+            self._data.pop(key, None)
 
 
 def cache_result(timeout=300, key_prefix=''):
     """
     Decorator to cache function results
+    
+    Hot keys are served from a per-process L1 cache for up to 5 seconds
+    before falling through to the shared cache backend. A timeout of None
+    caches in the shared backend without expiry.
     """
     def decorator(func):
+        local_cache = LocalTTLCache(maxsize=1024, ttl=5 if timeout is None else min(timeout, 5))
+        
         @wraps(func)
         def wrapper(*args, **kwargs):
-            # Create cache key from function name and arguments
-            cache_key = f"{key_prefix}_{func.__name__}_{hash(str(args) + str(sorted(kwargs.items())))}"
+            # Create cache key from function name and arguments. hash() of a
+            # str differs between processes, so use a stable digest instead.
+            arguments = (str(args) + str(sorted(kwargs.items()))).encode()
+            cache_key = f"{key_prefix}_{func.__name__}_{hashlib.md5(arguments).hexdigest()}"
+            
+            # Try the in-process cache, then the shared cache
+            result = local_cache.get(cache_key)
+            if result is not None:
+                return result
             
-            # Try to get from cache
             result = cache.get(cache_key)
             if result is not None:
+                local_cache.set(cache_key, result)
                 return result
             
             # Compute and cache result
             result = func(*args, **kwargs)
             cache.set(cache_key, result, timeout)
+            local_cache.set(cache_key, result)
             return result
         
         return wrapper
@@ -40,9 +100,13 @@ class OptimizedQueryMixin:
     """
     
     @classmethod
-    def get_optimized_queryset(cls):
+    def get_optimized_queryset(cls, prefetch=()):
         """
-        Get queryset with optimized select_related and prefetch_related
+        Get queryset with select_related for foreign keys.
+        
+        Many-to-many relations are only prefetched when named in ``prefetch``:
+        each prefetch is an extra query whose rows are held in memory, which
+        is wasted whenever the caller never reads the relation.
         """
         queryset = cls.objects.all()
         
@@ -55,14 +119,9 @@ class OptimizedQueryMixin:
             ]
             if foreign_keys:
                 queryset = queryset.select_related(*foreign_keys)
-            
-            # Automatically add prefetch_related for ManyToMany fields
-            many_to_many = [
-                field.name for field in cls._meta.get_fields() 
-                if isinstance(field, models.ManyToManyField)
-            ]
-            if many_to_many:
-                queryset = queryset.prefetch_related(*many_to_many)
+        
+        if prefetch:
+            queryset = queryset.prefetch_related(*prefetch)
         
         return queryset
 
@@ -98,22 +157,47 @@ class QueryOptimizer:
         """
         Optimize recording-related queries
         """
-        from recordings.models import Recording
+        from recordings.models import Recording, RecordingStatsCounter
+        
+        if connection.vendor in RECORDING_COUNTER_VENDORS:
+            # Totals are kept current by database triggers (recordings migration 0004)
+            counters = {row.status: row for row in RecordingStatsCounter.objects.all()}
+            total = sum(row.recording_count for row in counters.values())
+            duration_total = sum(row.duration_total for row in counters.values())
+            reviewed = counters.get(Recording.Status.REVIEWED)
+            pending = counters.get(Recording.Status.PENDING)
+            recording_stats = {
+                'total_recordings': total,
+                'reviewed_recordings': reviewed.recording_count if reviewed else 0,
+                'pending_recordings': pending.recording_count if pending else 0,
+                'avg_duration': duration_total / total if total else None,
+            }
+            performance_stats = {
+                'avg_fluency': (
+                    reviewed.fluency_total / reviewed.fluency_count
+                    if reviewed and reviewed.fluency_count else None
+                ),
+                'avg_accuracy': (
+                    reviewed.accuracy_total / reviewed.accuracy_count
+                    if reviewed and reviewed.accuracy_count else None
+                ),
+            }
+        else:
+            recording_stats = Recording.objects.aggregate(
+                total_recordings=Count('id'),
+                reviewed_recordings=Count('id', filter=models.Q(status=Recording.Status.REVIEWED)),
+                pending_recordings=Count('id', filter=models.Q(status=Recording.Status.PENDING)),
+                avg_duration=Avg('duration'),
+            )
+            performance_stats = Recording.objects.filter(status=Recording.Status.REVIEWED).aggregate(
+                avg_fluency=Avg('fluency_score'),
+                avg_accuracy=Avg('accuracy_score'),
+            )
         
         # Pre-cache recording statistics
-        recording_stats = Recording.objects.aggregate(
-            total_recordings=Count('id'),
-            reviewed_recordings=Count('id', filter=models.Q(status='reviewed')),
-            pending_recordings=Count('id', filter=models.Q(status='pending')),
-            avg_duration=Avg('duration'),
-        )
         cache.set('recording_statistics', recording_stats, 600)
         
         # Pre-cache performance metrics
-        performance_stats = Recording.objects.filter(status='reviewed').aggregate(
-            avg_fluency=Avg('fluency_score'),
-            avg_accuracy=Avg('accuracy_score'),
-        )
         cache.set('performance_statistics', performance_stats, 600)
     
     @staticmethod
@@ -181,7 +265,7 @@ class OptimizedRecordingManager(models.Manager):
             'assignment'
         ).filter(
             assignment__teacher=teacher,
-            status='pending'
+            status=self.model.Status.PENDING
         ).order_by('-created_at')
     
     def get_student_progress_data(self, student):
@@ -196,35 +280,148 @@ class OptimizedRecordingManager(models.Manager):
         ).order_by('created_at')
 
 
-# Database indexing recommendations
-DATABASE_INDEXES = {
-    'authentication_user': [
-        ['user_type', 'is_active'],  # For filtering users by type and status
-        ['email'],  # For login lookups
-        ['username'],  # For username lookups
-    ],
-    'recordings_recording': [
-        ['student_id', 'status'],  # For student recording queries
-        ['assignment_id', 'status'],  # For assignment recording queries
-        ['created_at'],  # For chronological queries
-        ['status', 'created_at'],  # For status-filtered chronological queries
-    ],
-    'assignments_assignment': [
-        ['teacher_id', 'is_active'],  # For teacher assignment queries
-        ['class_assigned_id', 'is_active'],  # For class assignment queries
-        ['due_date'],  # For deadline queries
-    ],
-    'analytics_studentflag': [
-        ['student_id', 'is_resolved'],  # For student flag queries
-        ['severity', 'is_resolved'],  # For priority flag queries
-        ['created_at'],  # For recent flag queries
-    ],
-    'analytics_studentanalytics': [
-        ['student_id'],  # For student analytics lookups
-        ['improvement_trend'],  # For trend analysis
-        ['submission_rate'],  # For performance queries
-    ]
-}
+class BloomFilter:
+    """
+    Fixed-size bloom filter backed by a Python int bitset so it pickles
+    compactly into the cache. Membership tests can return false positives
+    but never false negatives.
+    """
+    
+    HASH_COUNT = 4
+    
+    def __init__(self, capacity, error_rate=0.01):
+        self.size = max(64, int(-capacity * math.log(error_rate) / (math.log(2) ** 2)))
+        self.bits = 0
+    
+    def _positions(self, item):
+        # Double hashing: derive k positions from a single 128-bit digest
+        digest = hashlib.blake2b(str(item).encode(), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], 'big')
+        h2 = int.from_bytes(digest[8:], 'big') | 1
+        return [(h1 + i * h2) % self.size for i in range(self.HASH_COUNT)]
+    
+    def add(self, item):
+        for position in self._positions(item):
+            self.bits |= 1 << position
+    
+    def __contains__(self, item):
+        return all(self.bits >> position & 1 for position in self._positions(item))
+
+
+TEACHER_RECORDING_FILTER_TIMEOUT = 600  # 10 minutes
+TEACHER_RECORDING_FILTER_LOCK_TIMEOUT = 5  # seconds
+
+
+def _teacher_recording_filter_keys(teacher_id):
+    return (
+        f"bloom_teacher_recordings_version_{teacher_id}",
+        f"bloom_teacher_recordings_{teacher_id}",
+    )
+
+
+@contextmanager
+def _teacher_recording_filter_lock(teacher_id):
+    """
+    Serialize writers of a teacher's filter, so an added recording or an
+    invalidation cannot be overwritten by a concurrent writer. Writes are
+    a get and a set, so the wait is short; an abandoned lock expires.
+    """
+    lock_key = f"bloom_teacher_recordings_lock_{teacher_id}"
+    deadline = time.monotonic() + TEACHER_RECORDING_FILTER_LOCK_TIMEOUT
+    while not cache.add(lock_key, 1, TEACHER_RECORDING_FILTER_LOCK_TIMEOUT):
+        if time.monotonic() > deadline:
+            break
+        time.sleep(0.01)
+    try:
+        yield
+    finally:
+        cache.delete(lock_key)
+
+
+def teacher_may_own_recording(teacher_id, recording_id):
+    """
+    Check a teacher's recording bloom filter before hitting the database.
+    
+    A False result means the recording definitely does not belong to the
+    teacher; True means the caller still has to confirm with a query.
+    """
+    version_key, filter_key = _teacher_recording_filter_keys(teacher_id)
+    cached = cache.get_many([version_key, filter_key])
+    version = cached.get(version_key)
+    if version is None:
+        version = uuid.uuid4().hex
+        if not cache.add(version_key, version, None):
+            version = cache.get(version_key, version)
+    
+    entry = cached.get(filter_key)
+    if entry is not None and entry[0] == version:
+        return recording_id in entry[1]
+    
+    # Filter missing or stale: rebuild it from the teacher's recordings. The
+    # version read above is stored with the filter; writers change the
+    # version, so a rebuild racing with them is discarded on the next lookup.
+    from recordings.models import Recording
+    
+    recording_ids = list(
+        Recording.objects.filter(assignment__teacher_id=teacher_id).values_list('id', flat=True)
+    )
+    bloom = BloomFilter(capacity=max(1024, len(recording_ids) * 2))
+    for pk in recording_ids:
+        bloom.add(pk)
+    cache.set(filter_key, (version, bloom), TEACHER_RECORDING_FILTER_TIMEOUT)
+    
+    return recording_id in bloom
+
+
+def add_to_teacher_recording_filter(teacher_id, recording_id):
+    """
+    Add a newly created (committed) recording to the teacher's cached
+    filter. Without a current filter there is nothing to update; the
+    version still changes so that an in-flight rebuild which may have
+    missed the recording is not used.
+    """
+    version_key, filter_key = _teacher_recording_filter_keys(teacher_id)
+    with _teacher_recording_filter_lock(teacher_id):
+        cached = cache.get_many([version_key, filter_key])
+        entry = cached.get(filter_key)
+        version = uuid.uuid4().hex
+        if entry is not None and entry[0] == cached.get(version_key):
+            entry[1].add(recording_id)
+            cache.set(filter_key, (version, entry[1]), TEACHER_RECORDING_FILTER_TIMEOUT)
+        cache.set(version_key, version, None)
+
+
+def invalidate_teacher_recording_filter(teacher_id):
+    """
+    Force the teacher's recording bloom filter to be rebuilt on next lookup
+    """
+    version_key, _ = _teacher_recording_filter_keys(teacher_id)
+    with _teacher_recording_filter_lock(teacher_id):
+        cache.set(version_key, uuid.uuid4().hex, None)
+
+
+STORY_LIST_CACHE_TIMEOUT = 300  # 5 minutes
+STORY_LIST_VERSION_KEY = 'story_list_version'
+
+
+def get_story_list_version():
+    """
+    Current version token for cached story list responses. Cache keys
+    embed the token, so bumping it invalidates every grade and page at once.
+    """
+    version = cache.get(STORY_LIST_VERSION_KEY)
+    if version is None:
+        version = uuid.uuid4().hex
+        if not cache.add(STORY_LIST_VERSION_KEY, version, None):
+            version = cache.get(STORY_LIST_VERSION_KEY, version)
+    return version
+
+
+def invalidate_story_list_cache():
+    """
+    Drop all cached story list responses
+    """
+    cache.set(STORY_LIST_VERSION_KEY, uuid.uuid4().hex, None)
 
 
 def get_database_optimization_script():
@@ -235,18 +432,10 @@ def get_database_optimization_script():
         "-- Database Optimization Script for Reading Platform",
         "-- Generated for improved performance",
         "",
-        "-- Add database indexes for better query performance"
+        "-- Indexes are declared in each model's Meta.indexes and created by",
+        "-- migrations (CREATE INDEX CONCURRENTLY on PostgreSQL)",
     ]
     
-    for table, indexes in DATABASE_INDEXES.items():
-        sql_commands.append(f"\n-- Indexes for {table}")
-        for i, columns in enumerate(indexes):
-            index_name = f"idx_{table}_{i+1}_{'_'.join(columns)}"
-            column_list = ', '.join(columns)
-            sql_commands.append(
-                f"CREATE INDEX IF NOT EXISTS {index_name} ON {table} ({column_list});"
-            )
-    
     # Add query optimization settings
     sql_commands.extend([
         "",
@@ -190,6 +190,11 @@ REST_FRAMEWORK = {
     'DEFAULT_PERMISSION_CLASSES': [
         'rest_framework.permissions.IsAuthenticated',
     ],
+    'DEFAULT_PARSER_CLASSES': [
+        'security.parsers.CachedJSONParser',
+        'rest_framework.parsers.FormParser',
+        'rest_framework.parsers.MultiPartParser',
+    ],
     'DEFAULT_PAGINATION_CLASS': 'rest_framework.pagination.PageNumberPagination',
     'PAGE_SIZE': 20,
 }
@@ -206,6 +211,11 @@ CORS_ALLOW_CREDENTIALS = True
 MEDIA_URL = '/media/'
 MEDIA_ROOT = BASE_DIR / 'media'
 
+# Internal nginx location aliased to MEDIA_ROOT (e.g. /protected-audio/).
+# When set, audio is handed off with X-Accel-Redirect instead of being
+# streamed through Django; leave empty when no nginx sits in front.
+AUDIO_ACCEL_REDIRECT_PREFIX = config('AUDIO_ACCEL_REDIRECT_PREFIX', default='')
+
 # Custom user model (will be created in authentication app)
 AUTH_USER_MODEL = 'authentication.User'
 
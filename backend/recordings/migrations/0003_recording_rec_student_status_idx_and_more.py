@@ -0,0 +1,36 @@
+# Generated by Django 5.2.6 on 2026-10-15 22:32
+
+from django.conf import settings
+from django.db import migrations, models
+from performance.operations import AddIndexConcurrently
+
+
+class Migration(migrations.Migration):
+
+    atomic = False
+
+    dependencies = [
+        ('assignments', '0004_assignment_assign_teacher_active_idx_and_more'),
+        ('recordings', '0002_recording_accuracy_score_recording_attempt_number_and_more'),
+        ('stories', '0001_initial'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        AddIndexConcurrently(
+            model_name='recording',
+            index=models.Index(fields=['student', 'status'], name='rec_student_status_idx'),
+        ),
+        AddIndexConcurrently(
+            model_name='recording',
+            index=models.Index(fields=['assignment', 'status'], name='rec_assignment_status_idx'),
+        ),
+        AddIndexConcurrently(
+            model_name='recording',
+            index=models.Index(fields=['created_at'], name='rec_created_at_idx'),
+        ),
+        AddIndexConcurrently(
+            model_name='recording',
+            index=models.Index(fields=['status', 'created_at'], name='rec_status_created_idx'),
+        ),
+    ]
@@ -0,0 +1,157 @@
+# Generated by Django 5.2.6 on 2026-10-15 22:33
+
+from django.db import migrations, models
+
+
+# Adds (sign * row) to the counter row for a recording's status. Each
+# backend binds ROW/SIGN below to OLD/-1 or NEW/1.
+UPSERT_COUNTER = """
+    INSERT INTO recording_stats_counters (
+        status, recording_count, duration_total,
+        fluency_total, fluency_count, accuracy_total, accuracy_count
+    ) VALUES (
+        {row}.status, {sign}, {sign} * {row}.duration,
+        {sign} * COALESCE({row}.fluency_score, 0),
+        {sign} * (CASE WHEN {row}.fluency_score IS NULL THEN 0 ELSE 1 END),
+        {sign} * COALESCE({row}.accuracy_score, 0),
+        {sign} * (CASE WHEN {row}.accuracy_score IS NULL THEN 0 ELSE 1 END)
+    )
+    ON CONFLICT (status) DO UPDATE SET
+        recording_count = recording_stats_counters.recording_count + excluded.recording_count,
+        duration_total = recording_stats_counters.duration_total + excluded.duration_total,
+        fluency_total = recording_stats_counters.fluency_total + excluded.fluency_total,
+        fluency_count = recording_stats_counters.fluency_count + excluded.fluency_count,
+        accuracy_total = recording_stats_counters.accuracy_total + excluded.accuracy_total,
+        accuracy_count = recording_stats_counters.accuracy_count + excluded.accuracy_count;
+"""
+
+ADD_NEW = UPSERT_COUNTER.format(row='NEW', sign='1')
+SUBTRACT_OLD = UPSERT_COUNTER.format(row='OLD', sign='-1')
+
+SEED_COUNTERS = """
+    INSERT INTO recording_stats_counters (
+        status, recording_count, duration_total,
+        fluency_total, fluency_count, accuracy_total, accuracy_count
+    )
+    SELECT status, COUNT(*), COALESCE(SUM(duration), 0),
+           COALESCE(SUM(fluency_score), 0), COUNT(fluency_score),
+           COALESCE(SUM(accuracy_score), 0), COUNT(accuracy_score)
+    FROM recordings_recording
+    GROUP BY status;
+"""
+
+POSTGRESQL_INSTALL = [
+    f"""
+    CREATE OR REPLACE FUNCTION recording_stats_counters_trigger() RETURNS trigger AS $$
+    BEGIN
+        IF TG_OP IN ('UPDATE', 'DELETE') THEN
+            {SUBTRACT_OLD}
+        END IF;
+        IF TG_OP IN ('INSERT', 'UPDATE') THEN
+            {ADD_NEW}
+        END IF;
+        RETURN NULL;
+    END;
+    $$ LANGUAGE plpgsql;
+    """,
+    """
+    CREATE TRIGGER recording_stats_insert_delete
+    AFTER INSERT OR DELETE ON recordings_recording
+    FOR EACH ROW EXECUTE FUNCTION recording_stats_counters_trigger();
+    """,
+    """
+    CREATE TRIGGER recording_stats_update
+    AFTER UPDATE ON recordings_recording
+    FOR EACH ROW
+    WHEN (
+        OLD.status IS DISTINCT FROM NEW.status
+        OR OLD.duration IS DISTINCT FROM NEW.duration
+        OR OLD.fluency_score IS DISTINCT FROM NEW.fluency_score
+        OR OLD.accuracy_score IS DISTINCT FROM NEW.accuracy_score
+    )
+    EXECUTE FUNCTION recording_stats_counters_trigger();
+    """,
+]
+
+POSTGRESQL_UNINSTALL = [
+    "DROP TRIGGER IF EXISTS recording_stats_update ON recordings_recording;",
+    "DROP TRIGGER IF EXISTS recording_stats_insert_delete ON recordings_recording;",
+    "DROP FUNCTION IF EXISTS recording_stats_counters_trigger();",
+]
+
+SQLITE_INSTALL = [
+    f"""
+    CREATE TRIGGER recording_stats_insert
+    AFTER INSERT ON recordings_recording
+    BEGIN {ADD_NEW} END;
+    """,
+    f"""
+    CREATE TRIGGER recording_stats_delete
+    AFTER DELETE ON recordings_recording
+    BEGIN {SUBTRACT_OLD} END;
+    """,
+    f"""
+    CREATE TRIGGER recording_stats_update
+    AFTER UPDATE ON recordings_recording
+    WHEN OLD.status IS NOT NEW.status
+        OR OLD.duration IS NOT NEW.duration
+        OR OLD.fluency_score IS NOT NEW.fluency_score
+        OR OLD.accuracy_score IS NOT NEW.accuracy_score
+    BEGIN {SUBTRACT_OLD} {ADD_NEW} END;
+    """,
+]
+
+SQLITE_UNINSTALL = [
+    "DROP TRIGGER IF EXISTS recording_stats_update;",
+    "DROP TRIGGER IF EXISTS recording_stats_delete;",
+    "DROP TRIGGER IF EXISTS recording_stats_insert;",
+]
+
+TRIGGER_SQL = {
+    'postgresql': (POSTGRESQL_INSTALL, POSTGRESQL_UNINSTALL),
+    'sqlite': (SQLITE_INSTALL, SQLITE_UNINSTALL),
+}
+
+
+def install_triggers(apps, schema_editor):
+    # Other backends keep computing the statistics with aggregates.
+    if schema_editor.connection.vendor not in TRIGGER_SQL:
+        return
+    install, _ = TRIGGER_SQL[schema_editor.connection.vendor]
+    schema_editor.execute(SEED_COUNTERS)
+    for statement in install:
+        schema_editor.execute(statement)
+
+
+def remove_triggers(apps, schema_editor):
+    if schema_editor.connection.vendor not in TRIGGER_SQL:
+        return
+    _, uninstall = TRIGGER_SQL[schema_editor.connection.vendor]
+    for statement in uninstall:
+        schema_editor.execute(statement)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('recordings', '0003_recording_rec_student_status_idx_and_more'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='RecordingStatsCounter',
+            fields=[
+                ('status', models.CharField(max_length=10, primary_key=True, serialize=False)),
+                ('recording_count', models.BigIntegerField(default=0)),
+                ('duration_total', models.BigIntegerField(default=0)),
+                ('fluency_total', models.BigIntegerField(default=0)),
+                ('fluency_count', models.BigIntegerField(default=0)),
+                ('accuracy_total', models.BigIntegerField(default=0)),
+                ('accuracy_count', models.BigIntegerField(default=0)),
+            ],
+            options={
+                'db_table': 'recording_stats_counters',
+            },
+        ),
+        migrations.RunPython(install_triggers, remove_triggers),
+    ]
@@ -0,0 +1,61 @@
+# Generated by Django 5.2.6 on 2026-10-15 22:37
+
+from importlib import import_module
+
+from django.db import migrations, models
+
+
+STATUS_CODES = {'pending': 1, 'reviewed': 2, 'flagged': 3}
+
+# Reuse the counter trigger definitions from the migration that introduced them
+stats_counters = import_module('recordings.migrations.0004_recording_stats_counters')
+
+
+def drop_counter_triggers(apps, schema_editor):
+    # Triggers reference the status column and would block (PostgreSQL) or be
+    # lost in (SQLite table rebuild) the type change; the counters are re-seeded
+    stats_counters.remove_triggers(apps, schema_editor)
+    schema_editor.execute("DELETE FROM recording_stats_counters;")
+
+
+def install_counter_triggers(apps, schema_editor):
+    schema_editor.execute("DELETE FROM recording_stats_counters;")
+    stats_counters.install_triggers(apps, schema_editor)
+
+
+def statuses_to_codes(apps, schema_editor):
+    Recording = apps.get_model('recordings', 'Recording')
+    for slug, code in STATUS_CODES.items():
+        Recording.objects.filter(status=slug).update(status=str(code))
+
+
+def codes_to_statuses(apps, schema_editor):
+    Recording = apps.get_model('recordings', 'Recording')
+    for slug, code in STATUS_CODES.items():
+        Recording.objects.filter(status=str(code)).update(status=slug)
+
+
+class Migration(migrations.Migration):
+
+    # Each status is converted in its own UPDATE instead of one long transaction
+    atomic = False
+
+    dependencies = [
+        ('recordings', '0004_recording_stats_counters'),
+    ]
+
+    operations = [
+        migrations.RunPython(drop_counter_triggers, install_counter_triggers),
+        migrations.RunPython(statuses_to_codes, codes_to_statuses),
+        migrations.AlterField(
+            model_name='recording',
+            name='status',
+            field=models.PositiveSmallIntegerField(choices=[(1, 'Pending Review'), (2, 'Reviewed'), (3, 'Flagged for Attention')], default=1),
+        ),
+        migrations.AlterField(
+            model_name='recordingstatscounter',
+            name='status',
+            field=models.PositiveSmallIntegerField(primary_key=True, serialize=False),
+        ),
+        migrations.RunPython(install_counter_triggers, drop_counter_triggers),
+    ]
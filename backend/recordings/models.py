@@ -7,11 +7,10 @@ class Recording(models.Model):
     """
     Model for student audio recordings of stories.
     """
-    STATUS_CHOICES = [
-        ('pending', 'Pending Review'),
-        ('reviewed', 'Reviewed'),
-        ('flagged', 'Flagged for Attention'),
-    ]
+    class Status(models.IntegerChoices):
+        PENDING = 1, 'Pending Review'
+        REVIEWED = 2, 'Reviewed'
+        FLAGGED = 3, 'Flagged for Attention'
     
     student = models.ForeignKey(
         settings.AUTH_USER_MODEL,
@@ -42,10 +41,9 @@ class Recording(models.Model):
         default=0,
         help_text="Recording duration in seconds"
     )
-    status = models.CharField(
-        max_length=10,
-        choices=STATUS_CHOICES,
-        default='pending'
+    status = models.PositiveSmallIntegerField(
+        choices=Status.choices,
+        default=Status.PENDING
     )
     grade = models.CharField(
         max_length=20,
@@ -85,6 +83,48 @@ class Recording(models.Model):
     
     class Meta:
         ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['student', 'status'], name='rec_student_status_idx'),  # Student recording queries
+            models.Index(fields=['assignment', 'status'], name='rec_assignment_status_idx'),  # Assignment recording queries
+            models.Index(fields=['created_at'], name='rec_created_at_idx'),  # Chronological queries
+            models.Index(fields=['status', 'created_at'], name='rec_status_created_idx'),  # Status-filtered chronological queries
+        ]
     
     def __str__(self):
         return f"{self.student.username} - {self.story.title} ({self.created_at.date()})"
+    
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # Lets signal handlers spot a recording moved to another assignment
+        if 'assignment_id' in instance.__dict__:
+            instance._loaded_assignment_id = instance.assignment_id
+        return instance
+    
+    @property
+    def status_slug(self):
+        """Lowercase status name (pending, reviewed, flagged) used by the API"""
+        return self.Status(self.status).name.lower()
+
+
+class RecordingStatsCounter(models.Model):
+    """
+    Running per-status recording totals.
+    
+    Rows are maintained by database triggers on recordings_recording (see
+    migration 0004), so statistics can be read without scanning the
+    recordings table. Never write to this model from Django.
+    """
+    status = models.PositiveSmallIntegerField(primary_key=True)
+    recording_count = models.BigIntegerField(default=0)
+    duration_total = models.BigIntegerField(default=0)
+    fluency_total = models.BigIntegerField(default=0)
+    fluency_count = models.BigIntegerField(default=0)
+    accuracy_total = models.BigIntegerField(default=0)
+    accuracy_count = models.BigIntegerField(default=0)
+    
+    class Meta:
+        db_table = 'recording_stats_counters'
+    
+    def __str__(self):
+        return f"{self.status}: {self.recording_count}"
@@ -3,18 +3,33 @@ from .models import Recording
 from stories.serializers import StoryListSerializer
 
 
+class RecordingStatusField(serializers.ChoiceField):
+    """Integer recording status exposed to clients as its slug (pending, reviewed, flagged)"""
+    
+    def __init__(self, **kwargs):
+        super().__init__(choices=[status.name.lower() for status in Recording.Status], **kwargs)
+    
+    def to_representation(self, value):
+        return Recording.Status(value).name.lower()
+    
+    def to_internal_value(self, data):
+        return Recording.Status[super().to_internal_value(data).upper()]
+
+
 class RecordingSerializer(serializers.ModelSerializer):
     student_name = serializers.CharField(source='student.get_full_name', read_only=True)
     student_username = serializers.CharField(source='student.username', read_only=True)
     story_title = serializers.CharField(source='story.title', read_only=True)
     audio_file = serializers.CharField(source='file_path', read_only=True)
+    status = RecordingStatusField(required=False)
+    status_display = serializers.CharField(source='get_status_display', read_only=True)
     
     class Meta:
         model = Recording
         fields = [
             'id', 'student', 'student_name', 'student_username',
             'story', 'story_title', 'assignment', 'file_path', 'audio_file',
-            'duration', 'status', 'grade', 'fluency_score', 'accuracy_score',
+            'duration', 'status', 'status_display', 'grade', 'fluency_score', 'accuracy_score',
             'teacher_feedback', 'reviewed_by', 'reviewed_at', 'attempt_number',
             'created_at', 'updated_at'
         ]
@@ -39,12 +54,14 @@ class RecordingListSerializer(serializers.ModelSerializer):
     student_username = serializers.CharField(source='student.username', read_only=True)
     story_title = serializers.CharField(source='story.title', read_only=True)
     audio_file = serializers.CharField(source='file_path', read_only=True)
+    status = RecordingStatusField(required=False)
+    status_display = serializers.CharField(source='get_status_display', read_only=True)
     
     class Meta:
         model = Recording
         fields = [
             'id', 'student_name', 'student_username', 'story_title', 'status',
-            'grade', 'teacher_feedback', 'duration', 'audio_file', 'attempt_number',
+            'status_display', 'grade', 'teacher_feedback', 'duration', 'audio_file', 'attempt_number',
             'created_at', 'updated_at'
         ]
 
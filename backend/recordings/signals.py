@@ -0,0 +1,41 @@
+"""
+Signal handlers keeping recording caches in sync with the database
+"""
+
+from django.db import transaction
+from django.db.models.signals import post_save
+from django.dispatch import receiver
+from assignments.models import Assignment
+from performance.optimizations import (
+    add_to_teacher_recording_filter,
+    invalidate_teacher_recording_filter,
+)
+from .models import Recording
+
+
+@receiver(post_save, sender=Recording)
+def recording_saved(sender, instance, created, **kwargs):
+    """
+    Add new recordings, and recordings moved to another assignment, to the
+    owning teacher's filter. Reviews and status changes cannot change
+    ownership and leave the filter alone.
+    """
+    moved = instance.assignment_id != getattr(instance, '_loaded_assignment_id', instance.assignment_id)
+    instance._loaded_assignment_id = instance.assignment_id
+    if not instance.assignment_id or not (created or moved):
+        return
+    
+    teacher_id = instance.assignment.teacher_id
+    recording_id = instance.pk
+    # After commit, so a filter rebuilt meanwhile cannot miss the row
+    transaction.on_commit(lambda: add_to_teacher_recording_filter(teacher_id, recording_id))
+
+
+@receiver(post_save, sender=Assignment)
+def assignment_saved(sender, instance, created, **kwargs):
+    """Assignments moved to another teacher take their recordings along"""
+    moved = instance.teacher_id != getattr(instance, '_loaded_teacher_id', instance.teacher_id)
+    instance._loaded_teacher_id = instance.teacher_id
+    if moved:
+        teacher_id = instance.teacher_id
+        transaction.on_commit(lambda: invalidate_teacher_recording_filter(teacher_id))
@@ -1,3 +1,231 @@
-from django.test import TestCase
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db import connection
+from django.db.migrations.executor import MigrationExecutor
+from django.test import TestCase, TransactionTestCase
+from assignments.models import Assignment
+from performance.optimizations import (
+    BloomFilter,
+    QueryOptimizer,
+    add_to_teacher_recording_filter,
+    invalidate_teacher_recording_filter,
+    teacher_may_own_recording,
+)
+from stories.models import Story
+from .models import Recording, RecordingStatsCounter
 
-# Create your tests here.
+User = get_user_model()
+
+
+class RecordingFixtureMixin:
+    """Creates a teacher, a student, a story and an assignment"""
+    
+    def setUp(self):
+        cache.clear()
+        self.teacher = User.objects.create_user(username='teacher', password='pw', user_type='teacher')
+        self.student = User.objects.create_user(username='student', password='pw', user_type='student')
+        self.story = Story.objects.create(title='The Fox', content='A fox.', grade_level='1')
+        self.assignment = Assignment.objects.create(teacher=self.teacher, story=self.story, title='Read')
+    
+    def create_recording(self, **kwargs):
+        kwargs.setdefault('assignment', self.assignment)
+        return Recording.objects.create(
+            student=self.student, story=self.story, file_path='r.webm', **kwargs
+        )
+
+
+class RecordingStatsCounterTests(RecordingFixtureMixin, TestCase):
+    """The trigger-maintained counters must always equal the aggregates"""
+    
+    def counters(self):
+        return {
+            row.status: (
+                row.recording_count, row.duration_total,
+                row.fluency_total, row.fluency_count,
+                row.accuracy_total, row.accuracy_count,
+            )
+            for row in RecordingStatsCounter.objects.all()
+            if row.recording_count
+        }
+    
+    def test_insert_counts_recording_under_its_status(self):
+        self.create_recording(duration=30)
+        self.create_recording(duration=12, fluency_score=4)
+        
+        self.assertEqual(self.counters(), {Recording.Status.PENDING: (2, 42, 4, 1, 0, 0)})
+    
+    def test_status_change_moves_totals(self):
+        recording = self.create_recording(duration=30)
+        recording.status = Recording.Status.REVIEWED
+        recording.fluency_score = 5
+        recording.accuracy_score = 3
+        recording.save()
+        
+        self.assertEqual(self.counters(), {Recording.Status.REVIEWED: (1, 30, 5, 1, 3, 1)})
+    
+    def test_queryset_update_is_counted(self):
+        self.create_recording(duration=10)
+        self.create_recording(duration=20)
+        Recording.objects.update(status=Recording.Status.FLAGGED)
+        
+        self.assertEqual(self.counters(), {Recording.Status.FLAGGED: (2, 30, 0, 0, 0, 0)})
+    
+    def test_update_of_other_fields_leaves_counters(self):
+        recording = self.create_recording(duration=10)
+        recording.teacher_feedback = 'Nice'
+        recording.save()
+        
+        self.assertEqual(self.counters(), {Recording.Status.PENDING: (1, 10, 0, 0, 0, 0)})
+    
+    def test_delete_subtracts_recording(self):
+        kept = self.create_recording(duration=10, status=Recording.Status.REVIEWED, fluency_score=2)
+        self.create_recording(duration=20, status=Recording.Status.REVIEWED, fluency_score=4).delete()
+        
+        self.assertEqual(self.counters(), {Recording.Status.REVIEWED: (1, 10, 2, 1, 0, 0)})
+        kept.delete()
+        self.assertEqual(self.counters(), {})
+    
+    def test_statistics_match_aggregates(self):
+        self.create_recording(duration=10)
+        self.create_recording(duration=20, status=Recording.Status.REVIEWED, fluency_score=3, accuracy_score=5)
+        self.create_recording(duration=45, status=Recording.Status.REVIEWED, fluency_score=4)
+        
+        QueryOptimizer.optimize_recording_queries()
+        
+        self.assertEqual(cache.get('recording_statistics'), {
+            'total_recordings': 3,
+            'reviewed_recordings': 2,
+            'pending_recordings': 1,
+            'avg_duration': 25,
+        })
+        self.assertEqual(cache.get('performance_statistics'), {
+            'avg_fluency': 3.5,
+            'avg_accuracy': 5,
+        })
+
+
+class StatusSmallintMigrationTests(TransactionTestCase):
+    """Migration 0005 converts statuses and re-seeds the counters by code"""
+    
+    migrate_from = [('recordings', '0004_recording_stats_counters')]
+    migrate_to = [('recordings', '0005_recording_status_smallint')]
+    
+    def setUp(self):
+        executor = MigrationExecutor(connection)
+        executor.migrate(self.migrate_from)
+        apps = executor.loader.project_state(self.migrate_from).apps
+        
+        user = apps.get_model('authentication', 'User').objects.create(username='student')
+        story = apps.get_model('stories', 'Story').objects.create(title='The Fox', content='A fox.', grade_level='1')
+        OldRecording = apps.get_model('recordings', 'Recording')
+        for status, duration in (('pending', 10), ('reviewed', 20), ('reviewed', 5)):
+            OldRecording.objects.create(
+                student=user, story=story, file_path='r.webm', status=status, duration=duration
+            )
+    
+    def tearDown(self):
+        executor = MigrationExecutor(connection)
+        executor.migrate(executor.loader.graph.leaf_nodes())
+    
+    def test_counters_keyed_by_status_code_after_conversion(self):
+        executor = MigrationExecutor(connection)
+        executor.migrate(self.migrate_to)
+        
+        counters = {
+            row.status: (row.recording_count, row.duration_total)
+            for row in RecordingStatsCounter.objects.all()
+        }
+        self.assertEqual(counters, {
+            Recording.Status.PENDING: (1, 10),
+            Recording.Status.REVIEWED: (2, 25),
+        })
+        
+        # The re-installed triggers keep counting against the new codes
+        Recording.objects.filter(status=Recording.Status.PENDING).update(status=Recording.Status.REVIEWED)
+        self.assertEqual(
+            RecordingStatsCounter.objects.get(status=Recording.Status.REVIEWED).recording_count, 3
+        )
+
+
+class TeacherRecordingFilterTests(RecordingFixtureMixin, TestCase):
+    """The bloom filter may report strangers, but never misses a recording"""
+    
+    def test_bloom_filter_has_no_false_negatives(self):
+        bloom = BloomFilter(capacity=1024)
+        for pk in range(5000):
+            bloom.add(pk)
+        
+        self.assertTrue(all(pk in bloom for pk in range(5000)))
+    
+    def test_created_recording_is_added_to_current_filter(self):
+        existing = self.create_recording()
+        self.assertTrue(teacher_may_own_recording(self.teacher.id, existing.id))
+        
+        with self.captureOnCommitCallbacks(execute=True):
+            created = self.create_recording()
+        
+        self.assertTrue(teacher_may_own_recording(self.teacher.id, existing.id))
+        self.assertTrue(teacher_may_own_recording(self.teacher.id, created.id))
+    
+    def test_rebuild_racing_with_add_is_discarded(self):
+        version_key = f"bloom_teacher_recordings_version_{self.teacher.id}"
+        filter_key = f"bloom_teacher_recordings_{self.teacher.id}"
+        teacher_may_own_recording(self.teacher.id, 0)
+        cache.delete(filter_key)
+        version = cache.get(version_key)
+        
+        # A rebuild reads the version, the recording commits and is added,
+        # then the rebuild stores a filter that lacks it
+        recording = self.create_recording()
+        add_to_teacher_recording_filter(self.teacher.id, recording.id)
+        cache.set(filter_key, (version, BloomFilter(capacity=1024)), 600)
+        
+        self.assertTrue(teacher_may_own_recording(self.teacher.id, recording.id))
+    
+    def test_recording_moved_to_another_teacher(self):
+        other_teacher = User.objects.create_user(username='other', password='pw', user_type='teacher')
+        other_assignment = Assignment.objects.create(teacher=other_teacher, story=self.story, title='Read')
+        recording = self.create_recording()
+        teacher_may_own_recording(other_teacher.id, 0)
+        
+        recording = Recording.objects.get(pk=recording.pk)
+        with self.captureOnCommitCallbacks(execute=True):
+            recording.assignment = other_assignment
+            recording.save()
+        
+        self.assertTrue(teacher_may_own_recording(other_teacher.id, recording.id))
+    
+    def test_assignment_moved_to_another_teacher(self):
+        other_teacher = User.objects.create_user(username='other', password='pw', user_type='teacher')
+        recording = self.create_recording()
+        teacher_may_own_recording(other_teacher.id, 0)
+        
+        assignment = Assignment.objects.get(pk=self.assignment.pk)
+        with self.captureOnCommitCallbacks(execute=True):
+            assignment.teacher = other_teacher
+            assignment.save()
+        
+        self.assertTrue(teacher_may_own_recording(other_teacher.id, recording.id))
+    
+    def test_invalidation_rebuilds_with_every_recording(self):
+        recordings = [self.create_recording() for _ in range(3)]
+        teacher_may_own_recording(self.teacher.id, 0)
+        
+        # Created outside on_commit handling, so only a rebuild sees it
+        recordings.append(self.create_recording())
+        invalidate_teacher_recording_filter(self.teacher.id)
+        
+        for recording in recordings:
+            self.assertTrue(teacher_may_own_recording(self.teacher.id, recording.id))
+    
+    def test_review_save_keeps_filter(self):
+        recording = self.create_recording()
+        teacher_may_own_recording(self.teacher.id, recording.id)
+        version = cache.get(f"bloom_teacher_recordings_version_{self.teacher.id}")
+        
+        with self.captureOnCommitCallbacks(execute=True) as callbacks:
+            recording.status = Recording.Status.REVIEWED
+            recording.save()
+        
+        self.assertEqual(callbacks, [])
+        self.assertEqual(cache.get(f"bloom_teacher_recordings_version_{self.teacher.id}"), version)
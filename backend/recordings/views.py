@@ -2,7 +2,10 @@ from rest_framework import generics, permissions, status
 from rest_framework.decorators import api_view, permission_classes
 from rest_framework.response import Response
 from rest_framework.parsers import MultiPartParser, FormParser
+from rest_framework.pagination import CursorPagination
 from django.utils import timezone
+from django.utils.cache import get_conditional_response
+from performance.optimizations import teacher_may_own_recording
 from .models import Recording
 from .serializers import RecordingSerializer, RecordingCreateSerializer, RecordingListSerializer, RecordingReviewSerializer
 
@@ -18,21 +21,35 @@ class StudentRecordingListView(generics.ListCreateAPIView):
         return RecordingListSerializer
     
     def get_queryset(self):
-        if self.request.user.is_student:
-            return Recording.objects.filter(student=self.request.user)
+        user = self.request.user
+        if user.is_student:
+            return Recording.objects.filter(student=user)
         return Recording.objects.none()
 
 
+class RecordingCursorPagination(CursorPagination):
+    """Keyset pagination so later pages don't count or skip earlier rows"""
+    ordering = ('-created_at', '-id')
+
+
 class TeacherRecordingListView(generics.ListAPIView):
     """List recordings for teacher review"""
     serializer_class = RecordingListSerializer
     permission_classes = [permissions.IsAuthenticated]
+    pagination_class = RecordingCursorPagination
     
     def get_queryset(self):
-        if self.request.user.is_teacher:
+        user = self.request.user
+        if user.is_teacher:
+            # Only load the columns RecordingListSerializer reads
             return Recording.objects.filter(
-                assignment__teacher=self.request.user
-            ).order_by('-created_at')
+                assignment__teacher=user
+            ).select_related('student', 'story').only(
+                'id', 'student', 'story', 'status', 'grade', 'teacher_feedback',
+                'duration', 'file_path', 'attempt_number', 'created_at', 'updated_at',
+                'student__username', 'student__first_name', 'student__last_name',
+                'story__title',
+            ).order_by('-created_at', '-id')
         return Recording.objects.none()
 
 
@@ -42,18 +59,37 @@ class RecordingDetailView(generics.RetrieveUpdateAPIView):
     permission_classes = [permissions.IsAuthenticated]
     
     def get_queryset(self):
-        if self.request.user.is_teacher:
-            return Recording.objects.filter(assignment__teacher=self.request.user)
-        elif self.request.user.is_student:
-            return Recording.objects.filter(student=self.request.user)
+        user = self.request.user
+        if user.is_teacher:
+            return Recording.objects.filter(assignment__teacher=user)
+        elif user.is_student:
+            return Recording.objects.filter(student=user)
         return Recording.objects.none()
     
+    def retrieve(self, request, *args, **kwargs):
+        # Answer conditional GETs from the row's updated_at before serializing
+        updated_at = self.get_queryset().filter(
+            pk=kwargs['pk']
+        ).values_list('updated_at', flat=True).first()
+        if updated_at is None:
+            return super().retrieve(request, *args, **kwargs)
+        
+        etag = f'W/"{kwargs["pk"]}-{updated_at.timestamp()}"'
+        not_modified = get_conditional_response(request, etag=etag)
+        if not_modified is not None:
+            return not_modified
+        
+        response = super().retrieve(request, *args, **kwargs)
+        response['ETag'] = etag
+        return response
+    
     def perform_update(self, serializer):
-        if self.request.user.is_teacher:
+        user = self.request.user
+        if user.is_teacher:
             serializer.save(
-                reviewed_by=self.request.user,
+                reviewed_by=user,
                 reviewed_at=timezone.now(),
-                status='reviewed'
+                status=Recording.Status.REVIEWED
             )
 
 
@@ -61,16 +97,24 @@ class RecordingDetailView(generics.RetrieveUpdateAPIView):
 @permission_classes([permissions.IsAuthenticated])
 def submit_recording_review(request, recording_id):
     """Submit a review for a recording"""
-    if not request.user.is_teacher:
+    user = request.user
+    if not user.is_teacher:
         return Response(
             {'error': 'Only teachers can submit reviews'}, 
             status=status.HTTP_403_FORBIDDEN
         )
     
+    # Stale or forged IDs are rejected without a database round-trip
+    if not teacher_may_own_recording(user.id, recording_id):
+        return Response(
+            {'error': 'Recording not found'}, 
+            status=status.HTTP_404_NOT_FOUND
+        )
+    
     try:
         recording = Recording.objects.get(
             id=recording_id,
-            assignment__teacher=request.user
+            assignment__teacher=user
         )
     except Recording.DoesNotExist:
         return Response(
@@ -85,9 +129,9 @@ def submit_recording_review(request, recording_id):
         recording.fluency_score = serializer.validated_data['fluency_score']
         recording.accuracy_score = serializer.validated_data['accuracy_score']
         recording.teacher_feedback = serializer.validated_data['feedback']
-        recording.reviewed_by = request.user
+        recording.reviewed_by = user
         recording.reviewed_at = timezone.now()
-        recording.status = 'reviewed'
+        recording.status = Recording.Status.REVIEWED
         recording.save()
         
         return Response({'message': 'Review submitted successfully'})
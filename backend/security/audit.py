@@ -3,20 +3,176 @@ Security audit utilities and automated security checks
 """
 
 import os
-import subprocess
-import json
+import pickle
+import sys
+import hashlib
 import logging
-from datetime import datetime, timedelta
-from django.conf import settings
+import time
+import zlib
+from bisect import bisect_right
+from collections import ChainMap
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import asdict, dataclass
+from importlib import metadata
+from itertools import chain, islice
+from stat import S_IROTH, S_IWOTH
+from datetime import datetime, timedelta, timezone as dt_timezone
+from django.conf import settings, UserSettingsHolder
 from django.core.cache import cache
-from django.contrib.auth import get_user_model
-from django.db.models import Count, Q
+from django.db import connections
+from django.db.models import Q
 from django.utils import timezone
 import re
+from .middleware import get_login_attempt_ips
 
 logger = logging.getLogger('security')
 
-User = get_user_model()
+# Header settings and the values they must hold
+_SECURITY_EXPECTED = (
+    ('SECURE_BROWSER_XSS_FILTER', True),
+    ('SECURE_CONTENT_TYPE_NOSNIFF', True),
+    ('X_FRAME_OPTIONS', 'DENY'),
+)
+
+# Settings that must be truthy when DEBUG is off
+_HTTPS_SETTINGS = (
+    'SESSION_COOKIE_SECURE',
+    'CSRF_COOKIE_SECURE',
+    'SECURE_HSTS_SECONDS',
+)
+
+# Security log messages worth reporting, keyed by regex group name
+_SUSPICIOUS_LABELS = {
+    'sql_injection': 'SQL injection attempt',
+    'xss': 'XSS attempt',
+    'path_traversal': 'Path traversal attempt',
+    'user_agent': 'Suspicious user agent',
+}
+_SUSPICIOUS_RE = re.compile(
+    b'|'.join(
+        b'(?P<%s>%s)' % (name.encode(), re.escape(label).encode())
+        for name, label in _SUSPICIOUS_LABELS.items()
+    ),
+    re.IGNORECASE,
+)
+
+# Letter grade for scores at or above each threshold
+_GRADE_THRESHOLDS = (0, 60, 70, 80, 90)
+_GRADES = ('F', 'D', 'C', 'B', 'A')
+
+# Every setting the audit reads; part of the report memoization key
+_AUDITED_SETTINGS = (
+    'DEBUG', 'SECRET_KEY', 'ALLOWED_HOSTS', 'MIDDLEWARE', 'DATABASES',
+    'AUTH_PASSWORD_VALIDATORS', 'SESSION_COOKIE_AGE',
+) + tuple(name for name, _ in _SECURITY_EXPECTED) + _HTTPS_SETTINGS
+
+# Configuration and dependency findings are reused while their inputs are
+# unchanged, for at most this many seconds; runtime checks always rerun
+AUDIT_TTL = 900
+AUDIT_WORKERS = 4
+_AUDIT_CACHE = {}
+
+
+@dataclass(slots=True)
+class Finding:
+    """
+    A single audit finding. Category and severity repeat across findings,
+    so they are interned; reports convert findings to dicts with asdict().
+    """
+    category: str
+    issue: str
+    severity: str
+    description: str
+    recommendation: str
+    
+    def __post_init__(self):
+        self.category = sys.intern(self.category)
+        self.severity = sys.intern(self.severity)
+
+
+def _run_audit(audit):
+    """
+    Run one audit section in a worker thread
+    """
+    try:
+        return audit()
+    finally:
+        # Worker threads open their own database connections
+        connections.close_all()
+
+
+def _sensitive_files():
+    """
+    Files whose permissions are audited
+    """
+    return [
+        settings.BASE_DIR / 'db.sqlite3',
+        settings.BASE_DIR / 'manage.py',
+    ]
+
+
+def _audit_inputs_key():
+    """
+    Digest of the inputs the configuration checks depend on: audited
+    settings, installed package versions and sensitive file metadata.
+    """
+    snap = _settings_snapshot()
+    digest = hashlib.blake2b(digest_size=16)
+    for name in _AUDITED_SETTINGS:
+        digest.update(repr((name, snap.get(name))).encode())
+    packages = sorted(
+        (dist.metadata['Name'] or '', dist.version) for dist in metadata.distributions()
+    )
+    digest.update(repr(packages).encode())
+    for file_path in _sensitive_files():
+        try:
+            stat = file_path.stat()
+        except OSError:
+            continue
+        digest.update(repr((str(file_path), stat.st_mode, stat.st_mtime_ns)).encode())
+    return digest.hexdigest()
+
+
+def _security_log_path():
+    """
+    File written by the handlers of the 'security' logger, if any
+    """
+    logging_config = getattr(settings, 'LOGGING', {})
+    handlers = logging_config.get('handlers', {})
+    security_logger = logging_config.get('loggers', {}).get('security', {})
+    for name in security_logger.get('handlers', ()):
+        filename = handlers.get(name, {}).get('filename')
+        if filename:
+            return filename
+    return None
+
+
+def _pack_report(report):
+    """
+    Compress a report for the shared cache; its repetitive text shrinks several-fold
+    """
+    return zlib.compress(pickle.dumps(report, protocol=pickle.HIGHEST_PROTOCOL), 6)
+
+
+def _unpack_report(packed):
+    if not isinstance(packed, bytes):
+        return packed  # Stored uncompressed by an older release
+    return pickle.loads(zlib.decompress(packed))
+
+
+def _settings_snapshot():
+    """
+    Plain mapping of the active settings, read without going through the
+    LazySettings proxy. Layers added by override_settings are searched first.
+    """
+    settings.DEBUG  # Force the lazy settings object to configure itself
+    layers = []
+    wrapped = settings._wrapped
+    while isinstance(wrapped, UserSettingsHolder):
+        layers.append(wrapped.__dict__)
+        wrapped = wrapped.default_settings
+    layers.append(vars(wrapped))
+    return ChainMap(*layers)
 
 
 class SecurityAuditor:
@@ -28,27 +184,68 @@ class SecurityAuditor:
         self.audit_results = []
         self.warnings = []
         self.critical_issues = []
+        self._sensitive_files = [str(file_path) for file_path in _sensitive_files()]
+        self._start = time.time()
     
     def run_full_audit(self):
         """
-        Run complete security audit
+        Run complete security audit.
+        
+        Sections that only depend on settings, installed packages and file
+        metadata are reused from the previous run while those inputs are
+        unchanged and it is younger than AUDIT_TTL. Runtime sections (users,
+        failed logins, logs) always run.
         """
         logger.info("Starting comprehensive security audit")
+        self._start = time.time()
+        
+        # (audit, whether its findings depend only on the inputs key)
+        audits = [
+            # Configuration audits
+            (self.audit_django_settings, True),
+            (self.audit_middleware_configuration, True),
+            (self.audit_database_configuration, True),
+            
+            # Code security audits
+            (self.audit_dependencies, True),
+            (self.audit_user_permissions, False),
+            (self.audit_authentication_settings, True),
+            
+            # Runtime security audits
+            (self.audit_failed_login_attempts, False),
+            (self.audit_suspicious_activities, False),
+            (self.audit_file_permissions, True),
+        ]
         
-        # Configuration audits
-        self.audit_django_settings()
-        self.audit_middleware_configuration()
-        self.audit_database_configuration()
-        
-        # Code security audits
-        self.audit_dependencies()
-        self.audit_user_permissions()
-        self.audit_authentication_settings()
-        
-        # Runtime security audits
-        self.audit_failed_login_attempts()
-        self.audit_suspicious_activities()
-        self.audit_file_permissions()
+        inputs_key = _audit_inputs_key()
+        memoized = None
+        if (
+            _AUDIT_CACHE.get('key') == inputs_key
+            and time.monotonic() - _AUDIT_CACHE['created'] < AUDIT_TTL
+        ):
+            memoized = _AUDIT_CACHE['sections']
+        to_run = [audit for audit, reusable in audits if memoized is None or not reusable]
+        
+        # The audits are independent and mostly wait on the database, cache,
+        # filesystem or the safety database, so overlap them. Results are
+        # merged here, in the order above.
+        with ThreadPoolExecutor(max_workers=AUDIT_WORKERS) as executor:
+            fresh = iter(list(executor.map(_run_audit, to_run)))
+        
+        sections = {}
+        for index, (audit, reusable) in enumerate(audits):
+            if reusable and memoized is not None:
+                critical, warnings, info = memoized[index]
+            else:
+                critical, warnings, info = next(fresh)
+            if reusable:
+                sections[index] = (critical, warnings, info)
+            self.critical_issues.extend(critical)
+            self.warnings.extend(warnings)
+            self.audit_results.extend(info)
+        
+        if memoized is None:
+            _AUDIT_CACHE.update(key=inputs_key, created=time.monotonic(), sections=sections)
         
         # Generate report
         report = self.generate_audit_report()
@@ -61,214 +258,267 @@ class SecurityAuditor:
         """
         Audit Django security settings
         """
-        issues = []
+        critical, warnings, info = [], [], []
+        snap = _settings_snapshot()
         
         # Check DEBUG setting
-        if settings.DEBUG:
-            self.critical_issues.append({
-                'category': 'Configuration',
-                'issue': 'DEBUG is enabled',
-                'severity': 'CRITICAL',
-                'description': 'DEBUG mode exposes sensitive information and should be disabled in production',
-                'recommendation': 'Set DEBUG = False in production settings'
-            })
+        if snap['DEBUG']:
+            critical.append(Finding(
+                'Configuration',
+                'DEBUG is enabled',
+                'CRITICAL',
+                'DEBUG mode exposes sensitive information and should be disabled in production',
+                'Set DEBUG = False in production settings'
+            ))
         
         # Check SECRET_KEY
-        if hasattr(settings, 'SECRET_KEY'):
-            if len(settings.SECRET_KEY) < 50:
-                self.critical_issues.append({
-                    'category': 'Configuration',
-                    'issue': 'Weak SECRET_KEY',
-                    'severity': 'CRITICAL',
-                    'description': 'SECRET_KEY is too short or weak',
-                    'recommendation': 'Use a strong, randomly generated SECRET_KEY of at least 50 characters'
-                })
+        if 'SECRET_KEY' in snap:
+            if len(snap['SECRET_KEY']) < 50:
+                critical.append(Finding(
+                    'Configuration',
+                    'Weak SECRET_KEY',
+                    'CRITICAL',
+                    'SECRET_KEY is too short or weak',
+                    'Use a strong, randomly generated SECRET_KEY of at least 50 characters'
+                ))
         
         # Check ALLOWED_HOSTS
-        if not settings.ALLOWED_HOSTS or '*' in settings.ALLOWED_HOSTS:
-            self.critical_issues.append({
-                'category': 'Configuration',
-                'issue': 'Insecure ALLOWED_HOSTS',
-                'severity': 'HIGH',
-                'description': 'ALLOWED_HOSTS is empty or contains wildcard',
-                'recommendation': 'Set specific hostnames in ALLOWED_HOSTS'
-            })
+        allowed_hosts = snap.get('ALLOWED_HOSTS')
+        if not allowed_hosts or '*' in allowed_hosts:
+            critical.append(Finding(
+                'Configuration',
+                'Insecure ALLOWED_HOSTS',
+                'HIGH',
+                'ALLOWED_HOSTS is empty or contains wildcard',
+                'Set specific hostnames in ALLOWED_HOSTS'
+            ))
         
         # Check security headers
-        security_settings = [
-            ('SECURE_BROWSER_XSS_FILTER', True),
-            ('SECURE_CONTENT_TYPE_NOSNIFF', True),
-            ('X_FRAME_OPTIONS', 'DENY'),
-        ]
-        
-        for setting, expected in security_settings:
-            if not hasattr(settings, setting) or getattr(settings, setting) != expected:
-                self.warnings.append({
-                    'category': 'Configuration',
-                    'issue': f'Missing or incorrect {setting}',
-                    'severity': 'MEDIUM',
-                    'description': f'{setting} should be set to {expected}',
-                    'recommendation': f'Set {setting} = {expected}'
-                })
+        for setting, expected in _SECURITY_EXPECTED:
+            if snap.get(setting) != expected:
+                warnings.append(Finding(
+                    'Configuration',
+                    f'Missing or incorrect {setting}',
+                    'MEDIUM',
+                    f'{setting} should be set to {expected}',
+                    f'Set {setting} = {expected}'
+                ))
         
         # Check HTTPS settings
-        if not settings.DEBUG:
-            https_settings = [
-                'SESSION_COOKIE_SECURE',
-                'CSRF_COOKIE_SECURE',
-                'SECURE_HSTS_SECONDS'
-            ]
-            
-            for setting in https_settings:
-                if not hasattr(settings, setting) or not getattr(settings, setting):
-                    self.warnings.append({
-                        'category': 'Configuration',
-                        'issue': f'Missing HTTPS setting: {setting}',
-                        'severity': 'MEDIUM',
-                        'description': f'{setting} should be enabled for HTTPS',
-                        'recommendation': f'Enable {setting} for production'
-                    })
+        if not snap['DEBUG']:
+            for setting in _HTTPS_SETTINGS:
+                if not snap.get(setting):
+                    warnings.append(Finding(
+                        'Configuration',
+                        f'Missing HTTPS setting: {setting}',
+                        'MEDIUM',
+                        f'{setting} should be enabled for HTTPS',
+                        f'Enable {setting} for production'
+                    ))
+        
+        return critical, warnings, info
     
     def audit_middleware_configuration(self):
         """
         Audit middleware security configuration
         """
+        critical, warnings, info = [], [], []
         required_middleware = [
             'django.middleware.security.SecurityMiddleware',
             'django.middleware.csrf.CsrfViewMiddleware',
             'django.contrib.auth.middleware.AuthenticationMiddleware',
         ]
         
-        middleware_list = getattr(settings, 'MIDDLEWARE', [])
+        # Position of each configured middleware, so membership and order are dict lookups
+        middleware_index = {
+            middleware: index
+            for index, middleware in enumerate(getattr(settings, 'MIDDLEWARE', ()))
+        }
         
         for required in required_middleware:
-            if required not in middleware_list:
-                self.warnings.append({
-                    'category': 'Middleware',
-                    'issue': f'Missing security middleware: {required}',
-                    'severity': 'HIGH',
-                    'description': f'Required security middleware {required} is not configured',
-                    'recommendation': f'Add {required} to MIDDLEWARE setting'
-                })
+            if required not in middleware_index:
+                warnings.append(Finding(
+                    'Middleware',
+                    f'Missing security middleware: {required}',
+                    'HIGH',
+                    f'Required security middleware {required} is not configured',
+                    f'Add {required} to MIDDLEWARE setting'
+                ))
         
         # Check middleware order
-        security_middleware = 'django.middleware.security.SecurityMiddleware'
-        if security_middleware in middleware_list:
-            index = middleware_list.index(security_middleware)
+        index = middleware_index.get('django.middleware.security.SecurityMiddleware')
+        if index is not None:
             if index > 2:  # Should be near the top
-                self.warnings.append({
-                    'category': 'Middleware',
-                    'issue': 'SecurityMiddleware not at top of stack',
-                    'severity': 'MEDIUM',
-                    'description': 'SecurityMiddleware should be placed early in middleware stack',
-                    'recommendation': 'Move SecurityMiddleware to the top of MIDDLEWARE list'
-                })
+                warnings.append(Finding(
+                    'Middleware',
+                    'SecurityMiddleware not at top of stack',
+                    'MEDIUM',
+                    'SecurityMiddleware should be placed early in middleware stack',
+                    'Move SecurityMiddleware to the top of MIDDLEWARE list'
+                ))
+        
+        return critical, warnings, info
     
     def audit_database_configuration(self):
         """
         Audit database security configuration
         """
+        critical, warnings, info = [], [], []
         db_config = settings.DATABASES.get('default', {})
         
         # Check for SQLite in production
         if not settings.DEBUG and db_config.get('ENGINE') == 'django.db.backends.sqlite3':
-            self.warnings.append({
-                'category': 'Database',
-                'issue': 'SQLite used in production',
-                'severity': 'MEDIUM',
-                'description': 'SQLite is not recommended for production use',
-                'recommendation': 'Use PostgreSQL or MySQL for production'
-            })
+            warnings.append(Finding(
+                'Database',
+                'SQLite used in production',
+                'MEDIUM',
+                'SQLite is not recommended for production use',
+                'Use PostgreSQL or MySQL for production'
+            ))
         
         # Check for empty database password
         if 'PASSWORD' in db_config and not db_config['PASSWORD']:
-            self.critical_issues.append({
-                'category': 'Database',
-                'issue': 'Empty database password',
-                'severity': 'CRITICAL',
-                'description': 'Database password is empty',
-                'recommendation': 'Set a strong database password'
-            })
+            critical.append(Finding(
+                'Database',
+                'Empty database password',
+                'CRITICAL',
+                'Database password is empty',
+                'Set a strong database password'
+            ))
+        
+        return critical, warnings, info
     
     def audit_dependencies(self):
         """
         Audit Python dependencies for known vulnerabilities
         """
+        critical, warnings, info = [], [], []
+        try:
+            from safety.safety import check as safety_check
+            from safety.models import Package
+        except ImportError:
+            return self._audit_dependencies_subprocess()
+        
+        # Check the running interpreter's distributions in-process
+        packages = [
+            Package(name=dist.metadata['Name'], version=dist.version)
+            for dist in metadata.distributions()
+            if dist.metadata['Name']
+        ]
+        try:
+            vulnerabilities, _ = safety_check(packages=packages, ignore_vulns={}, telemetry=False)
+        except Exception:
+            logger.exception("Dependency vulnerability check failed")
+            warnings.append(self._dependency_check_unavailable())
+            return critical, warnings, info
+        
+        for vuln in vulnerabilities:
+            critical.append(Finding(
+                'Dependencies',
+                f'Vulnerable dependency: {vuln.package_name or "unknown"}',
+                'HIGH',
+                vuln.advisory or 'Known security vulnerability',
+                f'Update to version {vuln.analyzed_version or "latest"}'
+            ))
+        
+        return critical, warnings, info
+    
+    def _audit_dependencies_subprocess(self):
+        """
+        Fall back to the safety CLI when the library cannot be imported
+        """
+        import json
+        import subprocess
+        
+        critical, warnings, info = [], [], []
         try:
-            # Check if safety is available
             result = subprocess.run(['safety', 'check', '--json'], 
                                   capture_output=True, text=True, timeout=30)
             
             if result.returncode == 0:
                 vulnerabilities = json.loads(result.stdout)
                 for vuln in vulnerabilities:
-                    self.critical_issues.append({
-                        'category': 'Dependencies',
-                        'issue': f'Vulnerable dependency: {vuln.get("package", "unknown")}',
-                        'severity': 'HIGH',
-                        'description': vuln.get('advisory', 'Known security vulnerability'),
-                        'recommendation': f'Update to version {vuln.get("analyzed_version", "latest")}'
-                    })
+                    critical.append(Finding(
+                        'Dependencies',
+                        f'Vulnerable dependency: {vuln.get("package", "unknown")}',
+                        'HIGH',
+                        vuln.get('advisory', 'Known security vulnerability'),
+                        f'Update to version {vuln.get("analyzed_version", "latest")}'
+                    ))
             
         except (subprocess.TimeoutExpired, subprocess.CalledProcessError, FileNotFoundError):
-            self.warnings.append({
-                'category': 'Dependencies',
-                'issue': 'Could not run dependency vulnerability check',
-                'severity': 'LOW',
-                'description': 'Safety tool not available for dependency scanning',
-                'recommendation': 'Install safety: pip install safety'
-            })
+            warnings.append(self._dependency_check_unavailable())
+        
+        return critical, warnings, info
+    
+    def _dependency_check_unavailable(self):
+        return Finding(
+            'Dependencies',
+            'Could not run dependency vulnerability check',
+            'LOW',
+            'Safety tool not available for dependency scanning',
+            'Install safety: pip install safety'
+        )
     
     def audit_user_permissions(self):
         """
         Audit user permissions and access patterns
         """
-        # Check for users with excessive permissions
-        superusers = User.objects.filter(is_superuser=True).count()
-        if superusers > 2:
-            self.warnings.append({
-                'category': 'User Management',
-                'issue': f'Too many superusers ({superusers})',
-                'severity': 'MEDIUM',
-                'description': 'Large number of superuser accounts increases risk',
-                'recommendation': 'Review and reduce number of superuser accounts'
-            })
-        
-        # Check for inactive admin accounts
-        inactive_admins = User.objects.filter(
-            Q(is_staff=True) | Q(is_superuser=True),
-            is_active=False
-        ).count()
+        from django.contrib.auth import get_user_model
+        User = get_user_model()
         
-        if inactive_admins > 0:
-            self.warnings.append({
-                'category': 'User Management',
-                'issue': f'Inactive admin accounts ({inactive_admins})',
-                'severity': 'LOW',
-                'description': 'Inactive admin accounts should be cleaned up',
-                'recommendation': 'Remove or properly deactivate unused admin accounts'
-            })
+        critical, warnings, info = [], [], []
         
-        # Check for users without recent activity
+        # Only whether each count passes its threshold matters, so each
+        # query stops after threshold + 1 rows instead of counting them all
         thirty_days_ago = timezone.now() - timedelta(days=30)
+        superusers = User.objects.filter(is_superuser=True).values_list('pk', flat=True)[:3].count()
+        has_inactive_admins = User.objects.filter(
+            Q(is_staff=True) | Q(is_superuser=True),
+            is_active=False
+        ).exists()
         stale_users = User.objects.filter(
             last_login__lt=thirty_days_ago,
             is_active=True
-        ).count()
+        ).values_list('pk', flat=True)[:11].count()
+        
+        # Check for users with excessive permissions
+        if superusers > 2:
+            warnings.append(Finding(
+                'User Management',
+                'Too many superusers (more than 2)',
+                'MEDIUM',
+                'Large number of superuser accounts increases risk',
+                'Review and reduce number of superuser accounts'
+            ))
         
+        # Check for inactive admin accounts
+        if has_inactive_admins:
+            warnings.append(Finding(
+                'User Management',
+                'Inactive admin accounts',
+                'LOW',
+                'Inactive admin accounts should be cleaned up',
+                'Remove or properly deactivate unused admin accounts'
+            ))
+        
+        # Check for users without recent activity
         if stale_users > 10:
-            self.warnings.append({
-                'category': 'User Management',
-                'issue': f'Many stale user accounts ({stale_users})',
-                'severity': 'LOW',
-                'description': 'Large number of inactive user accounts',
-                'recommendation': 'Review and deactivate unused accounts'
-            })
+            warnings.append(Finding(
+                'User Management',
+                'Many stale user accounts (more than 10)',
+                'LOW',
+                'Large number of inactive user accounts',
+                'Review and deactivate unused accounts'
+            ))
+        
+        return critical, warnings, info
     
     def audit_authentication_settings(self):
         """
         Audit authentication configuration
         """
+        critical, warnings, info = [], [], []
         # Check password validators
         password_validators = getattr(settings, 'AUTH_PASSWORD_VALIDATORS', [])
         
@@ -281,117 +531,138 @@ class SecurityAuditor:
         
         for required in required_validators:
             if required not in configured_validators:
-                self.warnings.append({
-                    'category': 'Authentication',
-                    'issue': f'Missing password validator: {required.split(".")[-1]}',
-                    'severity': 'MEDIUM',
-                    'description': f'Password validation is incomplete',
-                    'recommendation': f'Add {required} to AUTH_PASSWORD_VALIDATORS'
-                })
+                warnings.append(Finding(
+                    'Authentication',
+                    f'Missing password validator: {required.split(".")[-1]}',
+                    'MEDIUM',
+                    f'Password validation is incomplete',
+                    f'Add {required} to AUTH_PASSWORD_VALIDATORS'
+                ))
         
         # Check session settings
         session_age = getattr(settings, 'SESSION_COOKIE_AGE', 1209600)  # Default is 2 weeks
         if session_age > 86400:  # More than 1 day
-            self.warnings.append({
-                'category': 'Authentication',
-                'issue': 'Long session timeout',
-                'severity': 'LOW',
-                'description': f'Session timeout is {session_age/3600:.1f} hours',
-                'recommendation': 'Consider shorter session timeout for security'
-            })
+            warnings.append(Finding(
+                'Authentication',
+                'Long session timeout',
+                'LOW',
+                f'Session timeout is {session_age/3600:.1f} hours',
+                'Consider shorter session timeout for security'
+            ))
+        
+        return critical, warnings, info
     
     def audit_failed_login_attempts(self):
         """
         Audit recent failed login attempts
         """
-        # Check cache for recent failed attempts
-        failed_attempts_pattern = "login_attempts_*"
-        cache_keys = cache.keys(failed_attempts_pattern)
+        critical, warnings, info = [], [], []
+        # Fetch the counters of every IP LoginAttemptMiddleware has indexed in one round trip
+        attempt_ips = get_login_attempt_ips()
+        counters = cache.get_many([f"login_attempts_{ip}" for ip in attempt_ips])
         
         high_failure_ips = []
-        for key in cache_keys:
-            attempts = cache.get(key, 0)
+        for key, attempts in counters.items():
             if attempts > 10:  # High number of failures
                 ip = key.replace('login_attempts_', '')
                 high_failure_ips.append((ip, attempts))
         
         if high_failure_ips:
-            self.warnings.append({
-                'category': 'Authentication',
-                'issue': f'High failed login attempts from {len(high_failure_ips)} IPs',
-                'severity': 'MEDIUM',
-                'description': f'IPs with high failure rates: {high_failure_ips[:5]}',
-                'recommendation': 'Monitor and consider blocking persistent attackers'
-            })
+            warnings.append(Finding(
+                'Authentication',
+                f'High failed login attempts from {len(high_failure_ips)} IPs',
+                'MEDIUM',
+                f'IPs with high failure rates: {high_failure_ips[:5]}',
+                'Monitor and consider blocking persistent attackers'
+            ))
+        
+        return critical, warnings, info
     
     def audit_suspicious_activities(self):
         """
         Audit for suspicious activities in recent logs
         """
-        # This would typically check log files for suspicious patterns
-        # For now, we'll check for basic patterns
-        
-        suspicious_patterns = [
-            'SQL injection attempt',
-            'XSS attempt',
-            'Path traversal attempt',
-            'Suspicious user agent',
-        ]
-        
-        # In a real implementation, this would parse log files
-        # For now, we'll just note that log monitoring should be in place
-        self.audit_results.append({
-            'category': 'Monitoring',
-            'issue': 'Log monitoring status',
-            'severity': 'INFO',
-            'description': 'Automated log analysis should be configured',
-            'recommendation': 'Implement automated log analysis for security events'
-        })
+        critical, warnings, info = [], [], []
+        log_path = _security_log_path()
+        if log_path is None:
+            info.append(Finding(
+                'Monitoring',
+                'Log monitoring status',
+                'INFO',
+                'Automated log analysis should be configured',
+                'Implement automated log analysis for security events'
+            ))
+            return critical, warnings, info
+        
+        # One pass over the log; the combined pattern reports which event matched
+        hits = dict.fromkeys(_SUSPICIOUS_LABELS, 0)
+        try:
+            with open(log_path, 'rb') as log_file:
+                for line in log_file:
+                    match = _SUSPICIOUS_RE.search(line)
+                    if match:
+                        hits[match.lastgroup] += 1
+        except FileNotFoundError:
+            return critical, warnings, info
+        
+        for name, count in hits.items():
+            if count:
+                label = _SUSPICIOUS_LABELS[name]
+                warnings.append(Finding(
+                    'Monitoring',
+                    f'{label} events in security log ({count})',
+                    'MEDIUM',
+                    f'{log_path} contains {count} "{label}" entries',
+                    'Review the source IPs and consider blocking persistent attackers'
+                ))
+        
+        return critical, warnings, info
     
     def audit_file_permissions(self):
         """
         Audit file system permissions
         """
-        sensitive_files = [
-            settings.BASE_DIR / 'db.sqlite3',
-            settings.BASE_DIR / 'manage.py',
-        ]
-        
-        for file_path in sensitive_files:
-            if file_path.exists():
-                stat = file_path.stat()
-                permissions = oct(stat.st_mode)[-3:]
-                
-                # Check if file is world-readable
-                if permissions[-1] in ['4', '5', '6', '7']:
-                    self.warnings.append({
-                        'category': 'File Permissions',
-                        'issue': f'World-readable file: {file_path.name}',
-                        'severity': 'MEDIUM',
-                        'description': f'File {file_path} has permissions {permissions}',
-                        'recommendation': f'Restrict permissions: chmod 640 {file_path}'
-                    })
+        critical, warnings, info = [], [], []
+        for file_path in self._sensitive_files:
+            try:
+                file_stat = os.stat(file_path)
+            except FileNotFoundError:
+                continue
+            
+            # Check if file is world-readable or world-writable
+            if file_stat.st_mode & (S_IROTH | S_IWOTH):
+                world_writable = file_stat.st_mode & S_IWOTH
+                permissions = oct(file_stat.st_mode)[-3:]
+                warnings.append(Finding(
+                    'File Permissions',
+                    f'World-{"writable" if world_writable else "readable"} file: {os.path.basename(file_path)}',
+                    'HIGH' if world_writable else 'MEDIUM',
+                    f'File {file_path} has permissions {permissions}',
+                    f'Restrict permissions: chmod 640 {file_path}'
+                ))
+        
+        return critical, warnings, info
     
     def generate_audit_report(self):
         """
         Generate comprehensive audit report
         """
         report = {
-            'audit_timestamp': datetime.now().isoformat(),
+            'audit_timestamp': datetime.fromtimestamp(self._start, tz=dt_timezone.utc).isoformat(),
             'summary': {
                 'critical_issues': len(self.critical_issues),
                 'warnings': len(self.warnings),
                 'info_items': len(self.audit_results),
                 'total_items': len(self.critical_issues) + len(self.warnings) + len(self.audit_results)
             },
-            'critical_issues': self.critical_issues,
-            'warnings': self.warnings,
-            'audit_results': self.audit_results,
+            'critical_issues': [asdict(issue) for issue in self.critical_issues],
+            'warnings': [asdict(issue) for issue in self.warnings],
+            'audit_results': [asdict(issue) for issue in self.audit_results],
             'recommendations': self._generate_recommendations()
         }
         
         # Store report in cache for dashboard access
-        cache.set('security_audit_report', report, 3600)  # 1 hour
+        cache.set('security_audit_report', _pack_report(report), 3600)  # 1 hour
         
         return report
     
@@ -399,33 +670,17 @@ class SecurityAuditor:
         """
         Generate priority-ordered recommendations
         """
-        all_issues = self.critical_issues + self.warnings
-        
-        # Group by category
-        categories = {}
-        for issue in all_issues:
-            category = issue['category']
-            if category not in categories:
-                categories[category] = []
-            categories[category].append(issue)
-        
-        recommendations = []
-        
-        # Critical issues first
-        critical_recommendations = [
-            issue['recommendation'] for issue in self.critical_issues
-        ]
-        
-        # Then high-priority warnings
-        high_priority_warnings = [
-            issue['recommendation'] for issue in self.warnings
-            if issue['severity'] in ['HIGH', 'MEDIUM']
-        ]
-        
-        recommendations.extend(critical_recommendations)
-        recommendations.extend(high_priority_warnings)
-        
-        return recommendations[:10]  # Top 10 recommendations
+        # Critical issues first, then high-priority warnings
+        critical_recommendations = (
+            issue.recommendation for issue in self.critical_issues
+        )
+        high_priority_warnings = (
+            issue.recommendation for issue in self.warnings
+            if issue.severity in ('HIGH', 'MEDIUM')
+        )
+        
+        # Top 10 recommendations
+        return list(islice(chain(critical_recommendations, high_priority_warnings), 10))
 
 
 def run_security_audit():
@@ -441,7 +696,8 @@ def get_security_score():
     Calculate overall security score based on audit results
     """
     # Get latest audit report
-    report = cache.get('security_audit_report')
+    packed = cache.get('security_audit_report')
+    report = _unpack_report(packed) if packed else None
     if not report:
         # Run audit if no recent report
         report = run_security_audit()
@@ -449,34 +705,13 @@ def get_security_score():
     critical_count = report['summary']['critical_issues']
     warning_count = report['summary']['warnings']
     
-    # Calculate score (100 - deductions)
-    score = 100
-    score -= critical_count * 20  # 20 points per critical issue
-    score -= warning_count * 5    # 5 points per warning
-    
-    # Minimum score is 0
-    score = max(0, score)
+    # 100 minus 20 points per critical issue and 5 per warning, never below 0
+    score = max(0, 100 - 20 * critical_count - 5 * warning_count)
     
     return {
         'score': score,
-        'grade': _get_security_grade(score),
+        'grade': _GRADES[bisect_right(_GRADE_THRESHOLDS, score) - 1],
         'critical_issues': critical_count,
         'warnings': warning_count,
         'last_audit': report['audit_timestamp']
     }
-
-
-def _get_security_grade(score):
-    """
-    Convert security score to letter grade
-    """
-    if score >= 90:
-        return 'A'
-    elif score >= 80:
-        return 'B'
-    elif score >= 70:
-        return 'C'
-    elif score >= 60:
-        return 'D'
-    else:
-        return 'F'
\ No newline at end of file
@@ -2,9 +2,26 @@
 Django management command to run security audit
 """
 
+from io import StringIO
 from django.core.management.base import BaseCommand
 from security.audit import run_security_audit, get_security_score
-import json
+
+try:
+    import orjson
+    
+    def _dumps(obj):
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2).decode()
+except ImportError:
+    import json
+    
+    def _dumps(obj):
+        return json.dumps(obj, indent=2)
+
+_FORMATS = ('json', 'text')
+
+# Text report rules
+_BAR = '=' * 60
+_MINI = '-' * 20
 
 
 class Command(BaseCommand):
@@ -13,7 +30,7 @@ class Command(BaseCommand):
     def add_arguments(self, parser):
         parser.add_argument(
             '--format',
-            choices=['json', 'text'],
+            choices=_FORMATS,
             default='text',
             help='Output format (default: text)'
         )
@@ -34,7 +51,7 @@ class Command(BaseCommand):
         if options['score_only']:
             score_info = get_security_score()
             if options['format'] == 'json':
-                output = json.dumps(score_info, indent=2)
+                output = _dumps(score_info)
             else:
                 output = f"Security Score: {score_info['score']}/100 (Grade: {score_info['grade']})\n"
                 output += f"Critical Issues: {score_info['critical_issues']}\n"
@@ -46,7 +63,7 @@ class Command(BaseCommand):
             report = run_security_audit()
             
             if options['format'] == 'json':
-                output = json.dumps(report, indent=2)
+                output = _dumps(report)
             else:
                 output = self._format_text_report(report)
         
@@ -62,50 +79,48 @@ class Command(BaseCommand):
     
     def _format_text_report(self, report):
         """Format report as readable text"""
-        output = []
+        buf = StringIO()
+        write = buf.write
         
         # Header
-        output.append("=" * 60)
-        output.append("SECURITY AUDIT REPORT")
-        output.append("=" * 60)
-        output.append(f"Audit Date: {report['audit_timestamp']}")
-        output.append("")
+        write(f"{_BAR}\nSECURITY AUDIT REPORT\n{_BAR}\n")
+        write(f"Audit Date: {report['audit_timestamp']}\n\n")
         
         # Summary
         summary = report['summary']
-        output.append("SUMMARY")
-        output.append("-" * 20)
-        output.append(f"Critical Issues: {summary['critical_issues']}")
-        output.append(f"Warnings: {summary['warnings']}")
-        output.append(f"Total Items: {summary['total_items']}")
-        output.append("")
+        write(
+            f"SUMMARY\n{_MINI}\n"
+            f"Critical Issues: {summary['critical_issues']}\n"
+            f"Warnings: {summary['warnings']}\n"
+            f"Total Items: {summary['total_items']}\n\n"
+        )
         
         # Critical Issues
         if report['critical_issues']:
-            output.append("CRITICAL ISSUES")
-            output.append("-" * 20)
+            write(f"CRITICAL ISSUES\n{_MINI}\n")
             for issue in report['critical_issues']:
-                output.append(f"• {issue['issue']} ({issue['category']})")
-                output.append(f"  {issue['description']}")
-                output.append(f"  → {issue['recommendation']}")
-                output.append("")
+                write(
+                    f"• {issue['issue']} ({issue['category']})\n"
+                    f"  {issue['description']}\n"
+                    f"  → {issue['recommendation']}\n\n"
+                )
         
         # Warnings
         if report['warnings']:
-            output.append("WARNINGS")
-            output.append("-" * 20)
+            write(f"WARNINGS\n{_MINI}\n")
             for warning in report['warnings']:
-                output.append(f"• {warning['issue']} ({warning['category']}) - {warning['severity']}")
-                output.append(f"  {warning['description']}")
-                output.append(f"  → {warning['recommendation']}")
-                output.append("")
+                write(
+                    f"• {warning['issue']} ({warning['category']}) - {warning['severity']}\n"
+                    f"  {warning['description']}\n"
+                    f"  → {warning['recommendation']}\n\n"
+                )
         
         # Top Recommendations
         if report['recommendations']:
-            output.append("TOP RECOMMENDATIONS")
-            output.append("-" * 20)
+            write(f"TOP RECOMMENDATIONS\n{_MINI}\n")
             for i, rec in enumerate(report['recommendations'], 1):
-                output.append(f"{i}. {rec}")
-            output.append("")
+                write(f"{i}. {rec}\n")
+            write("\n")
         
-        return "\n".join(output)
\ No newline at end of file
+        # Every block ends with a blank line; drop the last newline
+        return buf.getvalue()[:-1]
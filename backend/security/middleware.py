@@ -2,6 +2,7 @@
 Security middleware for the reading platform
 """
 
+import hashlib
 import json
 import logging
 from django.http import JsonResponse
@@ -9,61 +10,324 @@ from django.utils.deprecation import MiddlewareMixin
 from django.core.cache import cache
 from django.conf import settings
 from django.middleware.csrf import get_token
+from performance.optimizations import LocalTTLCache
+from .validators import _IGNORECASE_ASCII_LETTERS
 import re
+import threading
 import time
+import uuid
+from pathlib import Path
+
+try:
+    import hyperscan
+except ImportError:  # Optional; scanning falls back to the re module
+    hyperscan = None
+
+# Request bodies are decoded with orjson when available. Both decoders
+# raise ValueError on bad input and, like DRF's strict JSONParser, reject
+# NaN/Infinity.
+try:
+    import orjson
+    
+    def _loads_json(body):
+        return orjson.loads(body)
+except ImportError:
+    def _reject_constant(name):
+        raise ValueError(f"Out of range float value {name} is not JSON compliant")
+    
+    def _loads_json(body):
+        return json.loads(body, parse_constant=_reject_constant)
 
 logger = logging.getLogger(__name__)
 
+# Index of IPs that currently have a login_attempts_<ip> counter: a Redis
+# set behind RedisCache, otherwise a fixed number of marker slots that IPs
+# hash into (a collision drops the older IP from the index, never blocks)
+LOGIN_ATTEMPT_IPS_KEY = 'login_attempt_ips'
+LOGIN_ATTEMPT_IP_SLOTS = 256
+
+# Failed logins for one username from one IP before that pair is blocked.
+# Matches the per-IP limit, but unlike the IP counter it is not cleared when
+# another account logs in successfully from the same (e.g. school NAT) address
+LOGIN_USERNAME_MAX_ATTEMPTS = 5
+
+# Per-process copy of active login blocks, so a blocked client flooding the
+# login endpoint is refused without a shared-cache round trip
+_LOGIN_BLOCKS = LocalTTLCache(maxsize=8192, ttl=1800)
+
+# Sliding-window limiter run inside Redis (see ratelimit.lua)
+RATE_LIMIT_SCRIPT = (Path(__file__).parent / 'ratelimit.lua').read_text()
+
+# Per-process record of rate-limit keys Redis reported as over the limit,
+# held until a slot frees so blocked clients cost no round trip. Only
+# "blocked" decisions are cached; allowed requests always ask Redis.
+_RATE_LIMIT_BLOCKS = LocalTTLCache(maxsize=8192, ttl=3600)
+
+
+
+def _stop_scan(pattern_id, start, end, flags, context):
+    """Hyperscan match handler: the first match is enough"""
+    return True
+
+
+class PatternSet:
+    """
+    Case-insensitive "does any of these patterns occur" test.
+    
+    The compiled re alternation decides. When the Hyperscan library is
+    installed, all patterns are first scanned in a single pass by a database
+    compiled in prefilter mode, so only text it matches reaches re and the
+    verdict is the same either way.
+    """
+    
+    def __init__(self, patterns):
+        self.regex = re.compile('|'.join(f'(?:{p})' for p in patterns), re.IGNORECASE)
+        self.database = None
+        if hyperscan is not None:
+            self.database = hyperscan.Database(mode=hyperscan.HS_MODE_BLOCK)
+            self.database.compile(
+                expressions=[p.encode() for p in patterns],
+                flags=[
+                    hyperscan.HS_FLAG_CASELESS | hyperscan.HS_FLAG_UTF8 | hyperscan.HS_FLAG_UCP |
+                    hyperscan.HS_FLAG_SINGLEMATCH | hyperscan.HS_FLAG_PREFILTER
+                ] * len(patterns),
+            )
+            # Scratch space cannot be shared between concurrent scans
+            self._local = threading.local()
+    
+    def search(self, text):
+        """Return True if any pattern matches text"""
+        if self.database is not None and not self._may_match(text):
+            return False
+        return self.regex.search(text) is not None
+    
+    def _may_match(self, text):
+        """Hyperscan prefilter: False means no pattern can match text"""
+        if not text.isascii():
+            # Hyperscan's caseless mode does not fold the letters that
+            # re.IGNORECASE treats as ASCII ones
+            text = text.translate(_IGNORECASE_ASCII_LETTERS).lower()
+        try:
+            data = text.encode('utf-8')
+        except UnicodeEncodeError:
+            # Lone surrogates are not valid UTF-8 input for the database
+            return True
+        
+        scratch = getattr(self._local, 'scratch', None)
+        if scratch is None:
+            scratch = self._local.scratch = hyperscan.Scratch(self.database)
+        try:
+            self.database.scan(data, match_event_handler=_stop_scan, scratch=scratch)
+        except hyperscan.ScanTerminated:
+            return True
+        return False
+
+
+# Scanner user agents, matched as literals against the lowercased header
+_SUSPICIOUS_AGENTS_RE = re.compile('|'.join(map(re.escape, (
+    'sqlmap', 'nikto', 'nmap', 'masscan', 'nessus',
+    'burpsuite', 'owasp', 'zap', 'w3af', 'skipfish',
+))))
+
+# Largest request body accepted; DATA_UPLOAD_MAX_MEMORY_SIZE matches it
+MAX_REQUEST_BODY_SIZE = 10 * 1024 * 1024  # 10MB
+
+# Proxy headers that are inspected for suspicious content
+_SUSPICIOUS_HEADERS = (
+    'HTTP_X_FORWARDED_HOST',
+    'HTTP_X_ORIGINAL_URL',
+    'HTTP_X_REWRITE_URL',
+)
+
+_SUSPICIOUS_EXTENSIONS = ('.php', '.asp', '.jsp', '.cgi', '.pl', '.py', '.rb')
+
+# Rate limits per endpoint prefix: (max requests, window in seconds)
+ENDPOINT_LIMITS = {
+    '/api/auth/login/': (5, 300),      # 5 attempts per 5 minutes
+    '/api/auth/register/': (3, 600),   # 3 attempts per 10 minutes
+    '/api/recordings/': (50, 3600),    # 50 recordings per hour
+}
+DEFAULT_RATE_LIMIT = (100, 3600)       # 100 requests per hour default
+
+
+def _build_prefix_trie(table):
+    """
+    Character trie over the keys of table; the value for a complete
+    prefix is stored under the None key of its final node
+    """
+    root = {}
+    for prefix, value in table.items():
+        node = root
+        for char in prefix:
+            node = node.setdefault(char, {})
+        node[None] = value
+    return root
+
+
+_ENDPOINT_LIMITS_TRIE = _build_prefix_trie(ENDPOINT_LIMITS)
+
+
+def get_endpoint_limit(path):
+    """Rate limit of the longest ENDPOINT_LIMITS prefix of path"""
+    limit = DEFAULT_RATE_LIMIT
+    node = _ENDPOINT_LIMITS_TRIE
+    for char in path:
+        node = node.get(char)
+        if node is None:
+            break
+        limit = node.get(None, limit)
+    return limit
+
+# External API paths that require an X-API-Key header
+_API_KEY_PATHS = ('/api/external/', '/api/webhook/')
+
+# API endpoints that should be exempt from CSRF
+_CSRF_EXEMPT_PATHS = ('/api/auth/login/', '/api/auth/register/', '/api/webhook/')
+
+# Suspicious content in headers
+_SUSPICIOUS_PATTERNS = PatternSet((
+    r'<script[^>]*>',
+    r'javascript:',
+    r'vbscript:',
+    r'data:text/html',
+    r'\b(?:UNION|SELECT|INSERT|UPDATE|DELETE)\b',
+    r'(?:\.\./){2,}',  # Path traversal
+    r'%2e%2e%2f',      # URL encoded path traversal
+))
+
+# Prototype-pollution keys refused in JSON objects
+_SUSPICIOUS_JSON_KEYS = frozenset({'__proto__', 'constructor', 'prototype'})
+
+# Suspicious content in JSON string values
+_JSON_SUSPICIOUS_PATTERNS = PatternSet((
+    r'<script[^>]*>',
+    r'javascript:',
+    r'\b(?:UNION|SELECT|INSERT|UPDATE|DELETE)\b',
+))
+
+
+def _redis_client():
+    """
+    Raw redis-py client behind the default cache, or None when the cache
+    is not Django's RedisCache (e.g. LocMemCache in development)
+    """
+    from django.core.cache import caches
+    from django.core.cache.backends.redis import RedisCache
+    
+    backend = caches['default']
+    if not isinstance(backend, RedisCache):
+        return None
+    return backend._cache.get_client(write=True)
+
+
+def _login_attempt_ip_slot(client_ip):
+    """Marker key an IP is indexed under when Redis is not available"""
+    slot = int.from_bytes(hashlib.blake2b(client_ip.encode(), digest_size=2).digest(), 'big')
+    return f"{LOGIN_ATTEMPT_IPS_KEY}_{slot % LOGIN_ATTEMPT_IP_SLOTS}"
+
+
+def get_login_attempt_ips():
+    """IPs indexed by LoginAttemptMiddleware as having failed login counters"""
+    redis_client = _redis_client()
+    if redis_client is not None:
+        members = redis_client.smembers(cache.make_key(LOGIN_ATTEMPT_IPS_KEY))
+        return {member.decode() for member in members}
+    slots = [f"{LOGIN_ATTEMPT_IPS_KEY}_{slot}" for slot in range(LOGIN_ATTEMPT_IP_SLOTS)]
+    return set(cache.get_many(slots).values())
+
+
+# Deepest container level _validate_json_data accepts
+MAX_JSON_DEPTH = 5
+
+_JSON_STRING_RE = re.compile(rb'"[^"\\]*(?:\\.[^"\\]*)*"')
+_JSON_EMPTY_CONTAINER_RE = re.compile(rb'\[\]|\{\}')
+_NON_BRACKET_BYTES = bytes(b for b in range(256) if b not in b'[]{}')
+
+
+def _json_nesting_exceeds(body, max_nesting):
+    """
+    Whether a raw JSON body nests containers more than max_nesting deep.
+    
+    Decided without building the document: strings are removed, every byte
+    other than brackets is dropped and the innermost empty pairs are peeled
+    off one level at a time.
+    """
+    brackets = _JSON_STRING_RE.sub(b'', body).translate(None, _NON_BRACKET_BYTES)
+    for _ in range(max_nesting):
+        if not brackets:
+            return False
+        brackets = _JSON_EMPTY_CONTAINER_RE.sub(b'', brackets)
+    return bool(brackets)
+
+
+def get_client_ip(request):
+    """
+    Client IP address, parsed once per request and memoized on it
+    """
+    ip = getattr(request, '_client_ip', None)
+    if ip is None:
+        x_forwarded_for = request.META.get('HTTP_X_FORWARDED_FOR')
+        if x_forwarded_for:
+            ip = x_forwarded_for.partition(',')[0]
+        else:
+            ip = request.META.get('REMOTE_ADDR')
+        request._client_ip = ip
+    return ip
+
+
+# Content Security Policy
+_CSP_POLICY = '; '.join([
+    "default-src 'self'",
+    "script-src 'self' 'unsafe-inline' 'unsafe-eval'",  # Allow React
+    "style-src 'self' 'unsafe-inline' https://fonts.googleapis.com",
+    "font-src 'self' https://fonts.gstatic.com",
+    "img-src 'self' data: blob:",
+    "media-src 'self' blob:",
+    "connect-src 'self'",
+    "frame-ancestors 'none'",
+    "base-uri 'self'",
+    "form-action 'self'"
+])
+
+# Feature Policy / Permissions Policy
+_PERMISSIONS_POLICY = ', '.join([
+    "camera=()",
+    "microphone=(self)",  # Allow microphone for recordings
+    "geolocation=()",
+    "payment=()",
+    "usb=()"
+])
+
+# Headers added to every response
+_SECURITY_HEADERS = {
+    'X-Frame-Options': 'DENY',                   # Prevent clickjacking
+    'X-Content-Type-Options': 'nosniff',         # Prevent MIME sniffing
+    'X-XSS-Protection': '1; mode=block',         # Enable XSS protection
+    'Content-Security-Policy': _CSP_POLICY,
+    'Referrer-Policy': 'strict-origin-when-cross-origin',
+    'Permissions-Policy': _PERMISSIONS_POLICY,
+}
+
+# Production responses also force HTTPS
+_PRODUCTION_SECURITY_HEADERS = {
+    **_SECURITY_HEADERS,
+    'Strict-Transport-Security': 'max-age=31536000; includeSubDomains',
+}
+
 
 class SecurityHeadersMiddleware(MiddlewareMixin):
     """
     Add security headers to all responses
     """
     
+    def __init__(self, get_response=None):
+        super().__init__(get_response)
+        self.headers = _SECURITY_HEADERS if settings.DEBUG else _PRODUCTION_SECURITY_HEADERS
+    
     def process_response(self, request, response):
         """Add security headers"""
-        
-        # Prevent clickjacking
-        response['X-Frame-Options'] = 'DENY'
-        
-        # Prevent MIME sniffing
-        response['X-Content-Type-Options'] = 'nosniff'
-        
-        # Enable XSS protection
-        response['X-XSS-Protection'] = '1; mode=block'
-        
-        # Force HTTPS (in production)
-        if not settings.DEBUG:
-            response['Strict-Transport-Security'] = 'max-age=31536000; includeSubDomains'
-        
-        # Content Security Policy
-        csp_policy = [
-            "default-src 'self'",
-            "script-src 'self' 'unsafe-inline' 'unsafe-eval'",  # Allow React
-            "style-src 'self' 'unsafe-inline' https://fonts.googleapis.com",
-            "font-src 'self' https://fonts.gstatic.com",
-            "img-src 'self' data: blob:",
-            "media-src 'self' blob:",
-            "connect-src 'self'",
-            "frame-ancestors 'none'",
-            "base-uri 'self'",
-            "form-action 'self'"
-        ]
-        response['Content-Security-Policy'] = '; '.join(csp_policy)
-        
-        # Referrer Policy
-        response['Referrer-Policy'] = 'strict-origin-when-cross-origin'
-        
-        # Feature Policy / Permissions Policy
-        permissions_policy = [
-            "camera=()",
-            "microphone=(self)",  # Allow microphone for recordings
-            "geolocation=()",
-            "payment=()",
-            "usb=()"
-        ]
-        response['Permissions-Policy'] = ', '.join(permissions_policy)
-        
+        for header, value in self.headers.items():
+            response[header] = value
         return response
 
 
@@ -77,24 +341,12 @@ class RequestValidationMiddleware(MiddlewareMixin):
         
         # Check for suspicious user agents
         user_agent = request.META.get('HTTP_USER_AGENT', '')
-        suspicious_agents = [
-            'sqlmap', 'nikto', 'nmap', 'masscan', 'nessus',
-            'burpsuite', 'owasp', 'zap', 'w3af', 'skipfish'
-        ]
-        
-        for agent in suspicious_agents:
-            if agent.lower() in user_agent.lower():
-                logger.warning(f"Suspicious user agent detected: {user_agent}")
-                return JsonResponse({'error': 'Request blocked'}, status=403)
+        if _SUSPICIOUS_AGENTS_RE.search(user_agent.lower()):
+            logger.warning(f"Suspicious user agent detected: {user_agent}")
+            return JsonResponse({'error': 'Request blocked'}, status=403)
         
         # Check for suspicious headers
-        suspicious_headers = [
-            'HTTP_X_FORWARDED_HOST',
-            'HTTP_X_ORIGINAL_URL', 
-            'HTTP_X_REWRITE_URL'
-        ]
-        
-        for header in suspicious_headers:
+        for header in _SUSPICIOUS_HEADERS:
             if header in request.META:
                 value = request.META[header]
                 if self._contains_suspicious_content(value):
@@ -105,30 +357,20 @@ class RequestValidationMiddleware(MiddlewareMixin):
         if self._validate_request_path(request.path) is False:
             return JsonResponse({'error': 'Invalid request path'}, status=400)
         
-        # Check request size
-        if hasattr(request, 'body') and len(request.body) > 10 * 1024 * 1024:  # 10MB limit
-            logger.warning(f"Large request body detected: {len(request.body)} bytes")
+        # Check request size from the declared length, before any of the body is read
+        try:
+            content_length = int(request.META.get('CONTENT_LENGTH') or 0)
+        except ValueError:
+            content_length = 0  # WSGIRequest reads nothing for an invalid length
+        if content_length > MAX_REQUEST_BODY_SIZE:
+            logger.warning(f"Large request body detected: {content_length} bytes")
             return JsonResponse({'error': 'Request too large'}, status=413)
         
         return None
     
     def _contains_suspicious_content(self, content):
         """Check if content contains suspicious patterns"""
-        suspicious_patterns = [
-            r'<script[^>]*>',
-            r'javascript:',
-            r'vbscript:',
-            r'data:text/html',
-            r'(\bUNION\b|\bSELECT\b|\bINSERT\b|\bUPDATE\b|\bDELETE\b)',
-            r'(\.\.\/){2,}',  # Path traversal
-            r'%2e%2e%2f',     # URL encoded path traversal
-        ]
-        
-        for pattern in suspicious_patterns:
-            if re.search(pattern, content, re.IGNORECASE):
-                return True
-        
-        return False
+        return _SUSPICIOUS_PATTERNS.search(content)
     
     def _validate_request_path(self, path):
         """Validate request path for security issues"""
@@ -138,11 +380,9 @@ class RequestValidationMiddleware(MiddlewareMixin):
             return False
         
         # Check for suspicious file extensions
-        suspicious_extensions = ['.php', '.asp', '.jsp', '.cgi', '.pl', '.py', '.rb']
-        for ext in suspicious_extensions:
-            if path.endswith(ext):
-                logger.warning(f"Suspicious file extension in path: {path}")
-                return False
+        if path.endswith(_SUSPICIOUS_EXTENSIONS):
+            logger.warning(f"Suspicious file extension in path: {path}")
+            return False
         
         return True
 
@@ -152,6 +392,14 @@ class APISecurityMiddleware(MiddlewareMixin):
     API-specific security middleware
     """
     
+    def __init__(self, get_response=None):
+        super().__init__(get_response)
+        # redis-py sends EVALSHA and only loads the script when Redis lacks it
+        redis_client = _redis_client()
+        self._rate_limit_script = (
+            redis_client.register_script(RATE_LIMIT_SCRIPT) if redis_client else None
+        )
+    
     def process_request(self, request):
         """Process API security for requests"""
         
@@ -193,12 +441,19 @@ class APISecurityMiddleware(MiddlewareMixin):
         if request.method in ['POST', 'PUT', 'PATCH'] and request.content_type == 'application/json':
             try:
                 if hasattr(request, 'body') and request.body:
-                    data = json.loads(request.body)
+                    # Refuse deeply nested payloads before allocating them
+                    if _json_nesting_exceeds(request.body, MAX_JSON_DEPTH + 1):
+                        return JsonResponse({
+                            'error': 'Invalid request data'
+                        }, status=400)
+                    data = _loads_json(request.body)
                     if not self._validate_json_data(data):
                         return JsonResponse({
                             'error': 'Invalid request data'
                         }, status=400)
-            except json.JSONDecodeError:
+                    # Handed to the view by security.parsers.CachedJSONParser
+                    request._cached_json = data
+            except ValueError:
                 return JsonResponse({
                     'error': 'Invalid JSON format'
                 }, status=400)
@@ -212,46 +467,40 @@ class APISecurityMiddleware(MiddlewareMixin):
         if hasattr(request, 'user') and request.user.is_authenticated:
             user_id = request.user.id
         else:
-            user_id = self._get_client_ip(request)
+            user_id = get_client_ip(request)
         
-        # Different limits for different endpoints
-        endpoint_limits = {
-            '/api/auth/login/': (5, 300),      # 5 attempts per 5 minutes
-            '/api/auth/register/': (3, 600),   # 3 attempts per 10 minutes
-            '/api/recordings/': (50, 3600),    # 50 recordings per hour
-            'default': (100, 3600)             # 100 requests per hour default
-        }
+        max_requests, window = get_endpoint_limit(request.path)
+        cache_key = f"rl:{user_id}:{request.path}"
         
-        # Find matching limit
-        limit_info = endpoint_limits.get('default')
-        for endpoint, limits in endpoint_limits.items():
-            if endpoint != 'default' and request.path.startswith(endpoint):
-                limit_info = limits
-                break
-        
-        max_requests, window = limit_info
-        
-        # Create cache key
-        cache_key = f"rate_limit_{user_id}_{request.path.replace('/', '_')}"
-        
-        # Get current count
-        current_count = cache.get(cache_key, 0)
+        if self._rate_limit_script is not None:
+            if _RATE_LIMIT_BLOCKS.get(cache_key):
+                return True
+            now_ms = int(time.time() * 1000)
+            blocked_ms = self._rate_limit_script(
+                keys=[cache_key],
+                args=[now_ms, window * 1000, max_requests, f"{now_ms}-{uuid.uuid4().hex}"],
+            )
+            if blocked_ms:
+                _RATE_LIMIT_BLOCKS.set(cache_key, True, blocked_ms / 1000)
+                return True
+            return False
         
-        if current_count >= max_requests:
-            return True
+        # Fixed-window fallback for caches without Redis
+        # add() starts the window; incr() keeps its expiry and cannot lose updates
+        if cache.add(cache_key, 1, window):
+            return False
+        try:
+            current_count = cache.incr(cache_key)
+        except ValueError:
+            # Window expired between add() and incr()
+            cache.set(cache_key, 1, window)
+            return False
         
-        # Increment counter
-        cache.set(cache_key, current_count + 1, window)
-        return False
+        return current_count > max_requests
     
     def _requires_api_key(self, path):
         """Check if path requires API key"""
-        api_key_paths = [
-            '/api/external/',
-            '/api/webhook/',
-        ]
-        
-        return any(path.startswith(api_path) for api_path in api_key_paths)
+        return path.startswith(_API_KEY_PATHS)
     
     def _validate_api_key(self, api_key):
         """Validate API key"""
@@ -260,61 +509,43 @@ class APISecurityMiddleware(MiddlewareMixin):
         valid_keys = getattr(settings, 'API_KEYS', [])
         return api_key in valid_keys
     
-    def _validate_json_data(self, data, max_depth=5, current_depth=0):
-        """Validate JSON data structure"""
-        if current_depth > max_depth:
-            return False
-        
-        if isinstance(data, dict):
-            # Check for suspicious keys
-            suspicious_keys = ['__proto__', 'constructor', 'prototype']
-            for key in data.keys():
-                if key in suspicious_keys:
-                    return False
-                if not isinstance(key, str) or len(key) > 100:
-                    return False
-            
-            # Recursively validate values
-            for value in data.values():
-                if not self._validate_json_data(value, max_depth, current_depth + 1):
-                    return False
-        
-        elif isinstance(data, list):
-            # Check list length
-            if len(data) > 1000:
+    def _validate_json_data(self, data, max_depth=MAX_JSON_DEPTH, current_depth=0):
+        """Validate JSON data structure, walking it with an explicit stack"""
+        stack = [(data, current_depth)]
+        while stack:
+            data, current_depth = stack.pop()
+            if current_depth > max_depth:
                 return False
             
-            # Recursively validate items
-            for item in data:
-                if not self._validate_json_data(item, max_depth, current_depth + 1):
-                    return False
-        
-        elif isinstance(data, str):
-            # Check string length and content
-            if len(data) > 10000:
-                return False
+            if isinstance(data, dict):
+                # Check for suspicious keys
+                for key in data:
+                    if key in _SUSPICIOUS_JSON_KEYS:
+                        return False
+                    if not isinstance(key, str) or len(key) > 100:
+                        return False
+                
+                # Validate values one level down
+                stack.extend((value, current_depth + 1) for value in data.values())
             
-            # Check for suspicious patterns
-            suspicious_patterns = [
-                r'<script[^>]*>',
-                r'javascript:',
-                r'(\bUNION\b|\bSELECT\b|\bINSERT\b|\bUPDATE\b|\bDELETE\b)',
-            ]
+            elif isinstance(data, list):
+                # Check list length
+                if len(data) > 1000:
+                    return False
+                
+                # Validate items one level down
+                stack.extend((item, current_depth + 1) for item in data)
             
-            for pattern in suspicious_patterns:
-                if re.search(pattern, data, re.IGNORECASE):
+            elif isinstance(data, str):
+                # Check string length and content
+                if len(data) > 10000:
+                    return False
+                
+                # Check for suspicious patterns
+                if _JSON_SUSPICIOUS_PATTERNS.search(data):
                     return False
         
         return True
-    
-    def _get_client_ip(self, request):
-        """Get client IP address"""
-        x_forwarded_for = request.META.get('HTTP_X_FORWARDED_FOR')
-        if x_forwarded_for:
-            ip = x_forwarded_for.split(',')[0]
-        else:
-            ip = request.META.get('REMOTE_ADDR')
-        return ip
 
 
 class CSRFExemptionMiddleware(MiddlewareMixin):
@@ -325,17 +556,8 @@ class CSRFExemptionMiddleware(MiddlewareMixin):
     def process_request(self, request):
         """Handle CSRF for API requests"""
         
-        # API endpoints that should be exempt from CSRF
-        csrf_exempt_paths = [
-            '/api/auth/login/',
-            '/api/auth/register/',
-            '/api/webhook/',
-        ]
-        
         # Check if path should be CSRF exempt
-        is_exempt = any(request.path.startswith(path) for path in csrf_exempt_paths)
-        
-        if is_exempt:
+        if request.path.startswith(_CSRF_EXEMPT_PATHS):
             # Mark request as CSRF exempt
             setattr(request, '_dont_enforce_csrf_checks', True)
         
@@ -344,11 +566,17 @@ class CSRFExemptionMiddleware(MiddlewareMixin):
     def process_response(self, request, response):
         """Add CSRF token to response headers for SPA"""
         
-        if request.path.startswith('/api/') and hasattr(request, 'user'):
-            # Add CSRF token to response headers for authenticated users
-            if request.user.is_authenticated:
-                csrf_token = get_token(request)
-                response['X-CSRFToken'] = csrf_token
+        if not request.path.startswith('/api/') or 'X-CSRFToken' in response:
+            return response
+        
+        # Add CSRF token to response headers for authenticated users
+        user = getattr(request, 'user', None)
+        if user is not None and user.is_authenticated:
+            # get_token masks the secret afresh on every call; mask once per request
+            csrf_token = getattr(request, '_csrf_token_header', None)
+            if csrf_token is None:
+                csrf_token = request._csrf_token_header = get_token(request)
+            response['X-CSRFToken'] = csrf_token
         
         return response
 
@@ -364,47 +592,109 @@ class LoginAttemptMiddleware(MiddlewareMixin):
         if request.path != '/api/auth/login/' or request.method != 'POST':
             return None
         
-        client_ip = self._get_client_ip(request)
+        client_ip = get_client_ip(request)
+        pair = self._login_pair(request, client_ip)
+        request._login_pair = pair
         
-        # Check if IP is temporarily blocked
-        block_key = f"login_blocked_{client_ip}"
-        if cache.get(block_key):
+        # Check if IP, or this username from the IP, is temporarily blocked
+        block_keys = [f"login_blocked_{client_ip}", f"login_user_blocked_{pair}"]
+        if any(_LOGIN_BLOCKS.get(key) for key in block_keys) or self._shared_blocks(block_keys):
             return JsonResponse({
                 'error': 'Too many failed login attempts. Try again later.'
             }, status=429)
         
         return None
     
+    def _shared_blocks(self, block_keys):
+        """Read blocks from the shared cache, keeping a local copy until they expire"""
+        blocks = cache.get_many(block_keys)
+        now = time.time()
+        for key, blocked_until in blocks.items():
+            # Blocks written before expiry times were stored hold True
+            if not isinstance(blocked_until, bool) and blocked_until > now:
+                _LOGIN_BLOCKS.set(key, True, blocked_until - now)
+        return bool(blocks)
+    
+    def _block(self, key, seconds):
+        """Block a login key for seconds, both locally and in the shared cache"""
+        cache.set(key, time.time() + seconds, seconds)
+        _LOGIN_BLOCKS.set(key, True, seconds)
+    
     def process_response(self, request, response):
         """Track failed login attempts"""
         
         if request.path != '/api/auth/login/' or request.method != 'POST':
             return response
         
-        client_ip = self._get_client_ip(request)
+        client_ip = get_client_ip(request)
         attempts_key = f"login_attempts_{client_ip}"
+        pair = getattr(request, '_login_pair', None)
         
         # If login failed (status 400 or 401)
         if response.status_code in [400, 401]:
-            attempts = cache.get(attempts_key, 0) + 1
-            cache.set(attempts_key, attempts, 900)  # 15 minutes
+            attempts = self._increment_attempts(attempts_key)
+            self._index_attempt_ip(client_ip)
             
             # Block after 5 failed attempts
             if attempts >= 5:
-                cache.set(f"login_blocked_{client_ip}", True, 1800)  # 30 minutes
+                self._block(f"login_blocked_{client_ip}", 1800)  # 30 minutes
                 logger.warning(f"IP {client_ip} blocked due to excessive login attempts")
+            
+            if pair and self._increment_attempts(f"login_user_attempts_{pair}") >= LOGIN_USERNAME_MAX_ATTEMPTS:
+                self._block(f"login_user_blocked_{pair}", 900)  # 15 minutes
+                logger.warning(f"Username blocked for IP {client_ip} due to repeated login failures")
         
         # If login successful, clear attempts
         elif response.status_code == 200:
-            cache.delete(attempts_key)
+            keys = [attempts_key]
+            if pair:
+                keys.append(f"login_user_attempts_{pair}")
+            cache.delete_many(keys)
         
         return response
     
-    def _get_client_ip(self, request):
-        """Get client IP address"""
-        x_forwarded_for = request.META.get('HTTP_X_FORWARDED_FOR')
-        if x_forwarded_for:
-            ip = x_forwarded_for.split(',')[0]
+    def _login_pair(self, request, client_ip):
+        """
+        Cache key fragment for the (IP, submitted username) pair; the
+        username is hashed so arbitrary input never reaches a cache key
+        """
+        data = getattr(request, '_cached_json', None)
+        if data is None:
+            if request.content_type == 'application/json':
+                try:
+                    data = _loads_json(request.body)
+                except ValueError:
+                    data = None
+            else:
+                data = request.POST
+        username = data.get('username') if isinstance(data, dict) else None
+        if not isinstance(username, str):
+            username = ''
+        digest = hashlib.blake2b(username.encode('utf-8', 'replace'), digest_size=8).hexdigest()
+        return f"{client_ip}_{digest}"
+    
+    def _increment_attempts(self, attempts_key):
+        """Atomically count a failed attempt; the 15 minute window restarts on each failure"""
+        if cache.add(attempts_key, 1, 900):
+            return 1
+        try:
+            attempts = cache.incr(attempts_key)
+        except ValueError:
+            # Counter expired between add() and incr()
+            cache.set(attempts_key, 1, 900)
+            return 1
+        cache.touch(attempts_key, 900)
+        return attempts
+    
+    def _index_attempt_ip(self, client_ip):
+        """Record the IP so audits can find its counter without scanning cache keys"""
+        redis_client = _redis_client()
+        if redis_client is not None:
+            # SADD is atomic and O(1), however many IPs are indexed
+            key = cache.make_key(LOGIN_ATTEMPT_IPS_KEY)
+            pipeline = redis_client.pipeline(transaction=False)
+            pipeline.sadd(key, client_ip)
+            pipeline.expire(key, 900)
+            pipeline.execute()
         else:
-            ip = request.META.get('REMOTE_ADDR')
-        return ip
\ No newline at end of file
+            cache.set(_login_attempt_ip_slot(client_ip), client_ip, 900)
\ No newline at end of file
@@ -0,0 +1,18 @@
+"""
+Request parsers for the reading platform API
+"""
+
+from rest_framework.parsers import JSONParser
+
+
+class CachedJSONParser(JSONParser):
+    """
+    JSON parser that reuses the body already decoded by APISecurityMiddleware
+    """
+    
+    def parse(self, stream, media_type=None, parser_context=None):
+        request = (parser_context or {}).get('request')
+        http_request = getattr(request, '_request', None)
+        if hasattr(http_request, '_cached_json'):
+            return http_request._cached_json
+        return super().parse(stream, media_type, parser_context)
@@ -0,0 +1,26 @@
+-- Sliding-window rate limiter, evaluated atomically by Redis.
+--
+-- KEYS[1]  sorted set holding one member per accepted request, scored by time
+-- ARGV[1]  current time in milliseconds
+-- ARGV[2]  window length in milliseconds
+-- ARGV[3]  maximum requests allowed within the window
+-- ARGV[4]  unique member for this request
+--
+-- Returns 0 when the request was accepted. Over the limit, returns the
+-- milliseconds until the oldest request leaves the window (at least 1).
+
+local key = KEYS[1]
+local now = tonumber(ARGV[1])
+local window = tonumber(ARGV[2])
+local limit = tonumber(ARGV[3])
+
+redis.call('ZREMRANGEBYSCORE', key, 0, now - window)
+
+if redis.call('ZCARD', key) >= limit then
+    local oldest = redis.call('ZRANGE', key, 0, 0, 'WITHSCORES')
+    return math.max(tonumber(oldest[2]) + window - now, 1)
+end
+
+redis.call('ZADD', key, now, ARGV[4])
+redis.call('PEXPIRE', key, window)
+return 0
@@ -4,6 +4,7 @@ Secure serializers with enhanced validation
 
 from rest_framework import serializers
 from django.contrib.auth import authenticate
+from django.db.models import Q
 from django.contrib.auth.password_validation import validate_password
 from django.core.exceptions import ValidationError
 from .validators import SecurityValidator, InputSanitizer
@@ -32,6 +33,15 @@ class SecureLoginSerializer(serializers.Serializer):
         
         if username and password:
             user = authenticate(username=username, password=password)
+            if not user:
+                # Accounts registered before usernames stopped being
+                # escaped are stored under the old sanitized form, which
+                # only differs when the input had an HTML special character
+                raw_username = self.initial_data.get('username')
+                if isinstance(raw_username, str) and any(c in raw_username for c in '&<>"\''):
+                    legacy_username = InputSanitizer.sanitize_username_legacy(raw_username)
+                    if legacy_username != username:
+                        user = authenticate(username=legacy_username, password=password)
             if not user:
                 raise serializers.ValidationError('Invalid credentials')
             
@@ -61,25 +71,11 @@ class SecureRegistrationSerializer(serializers.Serializer):
     def validate_username(self, value):
         """Validate and sanitize username"""
         SecurityValidator.validate_user_input(value, 'username', max_length=150)
-        sanitized = InputSanitizer.sanitize_username(value)
-        
-        # Check if username already exists
-        from authentication.models import User
-        if User.objects.filter(username=sanitized).exists():
-            raise serializers.ValidationError('Username already exists')
-        
-        return sanitized
+        return InputSanitizer.sanitize_username(value)
     
     def validate_email(self, value):
         """Validate and sanitize email"""
-        sanitized = InputSanitizer.sanitize_email(value)
-        
-        # Check if email already exists
-        from authentication.models import User
-        if User.objects.filter(email=sanitized).exists():
-            raise serializers.ValidationError('Email already registered')
-        
-        return sanitized
+        return InputSanitizer.sanitize_email(value)
     
     def validate_password(self, value):
         """Validate password strength"""
@@ -94,18 +90,20 @@ class SecureRegistrationSerializer(serializers.Serializer):
     
     def validate_first_name(self, value):
         """Validate and sanitize first name"""
-        SecurityValidator.validate_user_input(value, 'first_name', max_length=30)
+        # Free-text fields only reach the database through the ORM, so
+        # they are checked for XSS but not for SQL patterns
+        SecurityValidator.validate_user_input(value, 'first_name', max_length=30, check_sqli=False)
         return InputSanitizer.sanitize_text_field(value, max_length=30)
     
     def validate_last_name(self, value):
         """Validate and sanitize last name"""
-        SecurityValidator.validate_user_input(value, 'last_name', max_length=30)
+        SecurityValidator.validate_user_input(value, 'last_name', max_length=30, check_sqli=False)
         return InputSanitizer.sanitize_text_field(value, max_length=30)
     
     def validate_school(self, value):
         """Validate and sanitize school name"""
         if value:
-            SecurityValidator.validate_user_input(value, 'school', max_length=100)
+            SecurityValidator.validate_user_input(value, 'school', max_length=100, check_sqli=False)
             return InputSanitizer.sanitize_text_field(value, max_length=100)
         return value
     
@@ -117,6 +115,23 @@ class SecureRegistrationSerializer(serializers.Serializer):
         if password != password_confirm:
             raise serializers.ValidationError('Passwords do not match')
         
+        # Check username and email availability in one query
+        from authentication.models import User
+        username = attrs.get('username')
+        email = attrs.get('email')
+        taken = User.objects.filter(
+            Q(username=username) | Q(email=email)
+        ).values_list('username', 'email')
+        
+        errors = {}
+        for existing_username, existing_email in taken:
+            if existing_username == username:
+                errors['username'] = ['Username already exists']
+            if existing_email == email:
+                errors['email'] = ['Email already registered']
+        if errors:
+            raise serializers.ValidationError(errors)
+        
         # Remove password_confirm from validated data
         attrs.pop('password_confirm', None)
         
@@ -188,7 +203,7 @@ class SecureFileUploadSerializer(serializers.Serializer):
     def validate_description(self, value):
         """Validate and sanitize description"""
         if value:
-            SecurityValidator.validate_user_input(value, 'description', max_length=500)
+            SecurityValidator.validate_user_input(value, 'description', max_length=500, check_sqli=False)
             return InputSanitizer.sanitize_text_field(value, max_length=500)
         return value
 
@@ -208,7 +223,7 @@ class SecureAudioFileSerializer(serializers.Serializer):
     def validate_title(self, value):
         """Validate and sanitize title"""
         if value:
-            SecurityValidator.validate_user_input(value, 'title', max_length=200)
+            SecurityValidator.validate_user_input(value, 'title', max_length=200, check_sqli=False)
             return InputSanitizer.sanitize_text_field(value, max_length=200)
         return value
 
@@ -222,7 +237,7 @@ class SecureTextContentSerializer(serializers.Serializer):
     
     def validate_content(self, value):
         """Validate and sanitize content"""
-        SecurityValidator.validate_user_input(value, 'content', max_length=10000)
+        SecurityValidator.validate_user_input(value, 'content', max_length=10000, check_sqli=False)
         
         # Check if HTML is allowed
         allow_html = self.initial_data.get('allow_html', False)
@@ -268,6 +283,18 @@ class SecureSearchSerializer(serializers.Serializer):
         if len(value) > 10:
             raise serializers.ValidationError('Too many filters (maximum 10)')
         
+        # Scan every string once; the per-value scan only runs to report a hit
+        strings = [key for key in value if isinstance(key, str)]
+        for filter_value in value.values():
+            if isinstance(filter_value, str):
+                strings.append(filter_value)
+            elif isinstance(filter_value, list):
+                strings.extend(item for item in filter_value if isinstance(item, str))
+        if SecurityValidator.contains_injection(*strings):
+            validate_input = SecurityValidator.validate_user_input
+        else:
+            validate_input = SecurityValidator.validate_input_length
+        
         # Validate each filter
         validated_filters = {}
         for key, filter_value in value.items():
@@ -275,12 +302,12 @@ class SecureSearchSerializer(serializers.Serializer):
             if not isinstance(key, str) or len(key) > 50:
                 raise serializers.ValidationError(f'Invalid filter key: {key}')
             
-            SecurityValidator.validate_user_input(key, 'filter_key', max_length=50)
+            validate_input(key, 'filter_key', max_length=50)
             clean_key = InputSanitizer.sanitize_text_field(key, max_length=50)
             
             # Validate filter value
             if isinstance(filter_value, str):
-                SecurityValidator.validate_user_input(filter_value, f'filter_{key}', max_length=100)
+                validate_input(filter_value, f'filter_{key}', max_length=100)
                 validated_filters[clean_key] = InputSanitizer.sanitize_text_field(filter_value, max_length=100)
             elif isinstance(filter_value, (int, float, bool)):
                 validated_filters[clean_key] = filter_value
@@ -290,7 +317,7 @@ class SecureSearchSerializer(serializers.Serializer):
                 validated_list = []
                 for item in filter_value:
                     if isinstance(item, str):
-                        SecurityValidator.validate_user_input(item, f'filter_{key}_item', max_length=100)
+                        validate_input(item, f'filter_{key}_item', max_length=100)
                         validated_list.append(InputSanitizer.sanitize_text_field(item, max_length=100))
                     elif isinstance(item, (int, float, bool)):
                         validated_list.append(item)
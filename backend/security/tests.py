@@ -0,0 +1,114 @@
+from unittest import mock
+from django.contrib.auth import authenticate, get_user_model
+from django.contrib.auth.models import AnonymousUser
+from django.core.cache import cache
+from django.http import HttpResponse
+from django.test import RequestFactory, TestCase
+from .middleware import APISecurityMiddleware, LOGIN_USERNAME_MAX_ATTEMPTS
+
+User = get_user_model()
+
+LOGIN_URL = '/api/auth/login/'
+
+
+class LoginTestMixin:
+    """Posts to the login endpoint from a chosen client IP"""
+    
+    def setUp(self):
+        cache.clear()
+    
+    def login(self, username, password, ip='10.0.0.1'):
+        return self.client.post(
+            LOGIN_URL, {'username': username, 'password': password},
+            content_type='application/json', REMOTE_ADDR=ip,
+        )
+
+
+class LegacyUsernameLoginTests(LoginTestMixin, TestCase):
+    """Accounts stored under the old escaped-and-stripped username"""
+    
+    def setUp(self):
+        super().setUp()
+        # Registered as "a&b" when sanitize_username still escaped input
+        User.objects.create_user(username='aampb', password='correct-horse', user_type='student')
+    
+    def test_legacy_account_logs_in_with_original_username(self):
+        self.assertEqual(self.login('a&b', 'correct-horse').status_code, 200)
+    
+    def test_legacy_account_wrong_password_is_refused(self):
+        self.assertEqual(self.login('a&b', 'wrong').status_code, 401)
+    
+    def test_non_string_username_is_refused(self):
+        self.assertEqual(self.login(12345, 'x').status_code, 401)
+    
+    def test_plain_username_authenticates_once(self):
+        with mock.patch('security.serializers.authenticate', wraps=authenticate) as auth:
+            self.login('ab', 'wrong')
+        
+        self.assertEqual(auth.call_count, 1)
+    
+    def test_username_with_html_character_retries_legacy_form(self):
+        with mock.patch('security.serializers.authenticate', wraps=authenticate) as auth:
+            self.login('a&b', 'wrong')
+        
+        self.assertEqual(
+            [call.kwargs['username'] for call in auth.call_args_list], ['ab', 'aampb']
+        )
+
+
+class LoginAttemptLimitTests(LoginTestMixin, TestCase):
+    """Failed logins block the (IP, username) pair, not the account"""
+    
+    def setUp(self):
+        super().setUp()
+        User.objects.create_user(username='bob', password='correct-horse', user_type='student')
+    
+    def test_failures_block_username_from_that_ip(self):
+        for _ in range(LOGIN_USERNAME_MAX_ATTEMPTS):
+            self.login('bob', 'wrong', ip='10.0.1.1')
+        
+        self.assertEqual(self.login('bob', 'correct-horse', ip='10.0.1.1').status_code, 429)
+    
+    def test_failures_from_other_ip_do_not_lock_account(self):
+        for _ in range(LOGIN_USERNAME_MAX_ATTEMPTS):
+            self.login('bob', 'wrong', ip='10.0.2.1')
+        
+        self.assertEqual(self.login('bob', 'correct-horse', ip='10.0.2.2').status_code, 200)
+
+
+class FallbackRateLimitTests(TestCase):
+    """Fixed-window counter used when the cache is not Redis"""
+    
+    def setUp(self):
+        cache.clear()
+        self.middleware = APISecurityMiddleware(lambda request: HttpResponse())
+        self.factory = RequestFactory()
+    
+    def is_limited(self, ip='10.0.3.1'):
+        request = self.factory.get('/api/auth/register/', REMOTE_ADDR=ip)
+        request.user = AnonymousUser()
+        return self.middleware._is_rate_limited(request)
+    
+    def test_requests_beyond_limit_are_refused(self):
+        # /api/auth/register/ allows 3 requests per window
+        self.assertEqual([self.is_limited() for _ in range(5)], [False, False, False, True, True])
+    
+    def test_clients_are_counted_separately(self):
+        for _ in range(4):
+            self.is_limited('10.0.3.2')
+        
+        self.assertFalse(self.is_limited('10.0.3.3'))
+    
+    def test_expired_window_starts_over(self):
+        for _ in range(4):
+            self.is_limited()
+        cache.delete('rl:10.0.3.1:/api/auth/register/')
+        
+        self.assertFalse(self.is_limited())
+    
+    def test_window_expiring_between_add_and_incr(self):
+        self.is_limited()
+        with mock.patch.object(cache, 'incr', side_effect=ValueError):
+            self.assertFalse(self.is_limited())
+        
+        self.assertEqual(cache.get('rl:10.0.3.1:/api/auth/register/'), 1)
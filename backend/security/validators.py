@@ -3,11 +3,27 @@ Security validation utilities for the reading platform
 """
 
 import re
+import string
+import threading
+from dataclasses import dataclass
+from functools import lru_cache, wraps
 from django.core.exceptions import ValidationError
 from django.utils.html import escape
-import bleach
 import logging
 
+try:
+    import hyperscan
+except ImportError:  # Optional; injection scans fall back to the re module
+    hyperscan = None
+
+# HTML is sanitized with nh3 (the Rust ammonia sanitizer) when available,
+# otherwise with bleach's pure Python html5lib-based Cleaner, which is only
+# imported once a cleaner is first needed
+try:
+    import nh3
+except ImportError:
+    nh3 = None
+
 logger = logging.getLogger(__name__)
 
 # Allowed HTML tags for user content
@@ -20,15 +36,322 @@ ALLOWED_HTML_ATTRIBUTES = {
     '*': ['class'],  # Only allow class attributes
 }
 
+# Injection patterns are lowercase and case-sensitive; they are matched
+# against the input lowercased once, which is cheaper than re.IGNORECASE
+# folding at every step. Non-ASCII letters that re.IGNORECASE treats as
+# ASCII letters are mapped first so the result is the same.
+_IGNORECASE_ASCII_LETTERS = str.maketrans({
+    '\u0130': 'i',  # İ, whose str.lower() is 'i' plus a combining dot
+    '\u0131': 'i',  # dotless ı
+    '\u017f': 's',  # long ſ
+})
+
+# Potential SQL injection patterns, as one alternation. Possessive
+# quantifiers keep the OR/AND tautology check from backtracking.
+_SQL_RE = re.compile(
+    r"\b(?:union|select|insert|update|delete|drop)\b"
+    r"|--|/\*|\*/"
+    r"|\b(?:or|and)\b\s++\d++\s*+=\s*+\d"
+    r"|\b(?:exec|eval|char|concat)\b"
+)
+
+# XSS patterns, as one alternation. Tag patterns are matched separately
+# by _has_script_block and _has_embedded_object, which do in linear time
+# what <script[^>]*>.*?</script> and <(?:iframe|object|embed)[^>]*> do in
+# quadratic time on inputs repeating the opening tag.
+_XSS_RE = re.compile(
+    r"javascript:"
+    r"|vbscript:"
+    r"|on(?:load|error|click)\s*+="
+)
+_EMBEDDED_OBJECT_RE = re.compile(r"<(?:iframe|object|embed)")
+
+# The SQL and XSS checks above as plain expressions, compiled by Hyperscan
+# in prefilter mode: text it does not match is free of every injection
+# pattern, so most inputs are cleared in one linear pass and only the rest
+# are confirmed with the re checks.
+_INJECTION_PREFILTER = (
+    rb"\b(?:union|select|insert|update|delete|drop)\b"
+    rb"|--|/\*|\*/"
+    rb"|\b(?:or|and)\b\s+\d+\s*=\s*\d"
+    rb"|\b(?:exec|eval|char|concat)\b",
+    rb"javascript:"
+    rb"|vbscript:"
+    rb"|on(?:load|error|click)\s*="
+    rb"|<script[^>]*>.*?</script>"
+    rb"|<(?:iframe|object|embed)[^>]*>",
+)
+
+# Compiled on first use; compiling takes tens of milliseconds that workers
+# which never validate input should not spend at startup
+_injection_database = None
+_injection_database_lock = threading.Lock()
+
+
+def _get_injection_database():
+    """The Hyperscan prefilter database, compiled once per process"""
+    global _injection_database
+    if _injection_database is None:
+        with _injection_database_lock:
+            if _injection_database is None:
+                database = hyperscan.Database(mode=hyperscan.HS_MODE_BLOCK)
+                database.compile(
+                    expressions=list(_INJECTION_PREFILTER),
+                    flags=[
+                        hyperscan.HS_FLAG_UTF8 | hyperscan.HS_FLAG_UCP |
+                        hyperscan.HS_FLAG_SINGLEMATCH | hyperscan.HS_FLAG_PREFILTER
+                    ] * len(_INJECTION_PREFILTER),
+                )
+                _injection_database = database
+    return _injection_database
+
+# Upload extensions refused for security reasons
+_DANGEROUS_EXTENSIONS = frozenset((
+    'exe', 'bat', 'cmd', 'com', 'scr',
+    'php', 'asp', 'jsp', 'py', 'pl'
+))
+
+# Password composition rules, tested against the password's character set
+_UPPERCASE = frozenset(string.ascii_uppercase)
+_LOWERCASE = frozenset(string.ascii_lowercase)
+_SPECIAL_CHARACTERS = frozenset('!@#$%^&*(),.?":{}|<>')
+_COMMON_PASSWORD_RE = re.compile(
+    r'123456|password|qwerty|abc123|admin|user|guest|test',
+    re.IGNORECASE,
+)
+
+# Basic email format validation
+_EMAIL_RE = re.compile(r'^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$')
+
+# Characters removed from usernames: anything but alphanumerics, underscore, hyphen and dot
+_USERNAME_STRIP_RE = re.compile(r'[^a-zA-Z0-9._-]')
+
+# Characters the sanitizer changes in plain text; text without any of them
+# comes back unchanged. nh3 rewrites markup and entity delimiters, NUL, CR
+# and no-break spaces, bleach markup and entity delimiters and control
+# characters other than tab and newline.
+if nh3 is not None:
+    _SANITIZER_CHANGES_RE = re.compile(r'[\x00\r&<>\xa0]')
+else:
+    _SANITIZER_CHANGES_RE = re.compile(r'[\x00-\x08\x0b-\x1f&<>]')
+
+# nh3 takes sets of tags and attribute names
+_NH3_TAGS = frozenset(ALLOWED_HTML_TAGS)
+_NH3_ATTRIBUTES = {tag: frozenset(names) for tag, names in ALLOWED_HTML_ATTRIBUTES.items()}
+
+
+def _nh3_clean(content, tags, attributes=None):
+    """nh3.clean, dropping lone surrogates that cannot be passed to Rust"""
+    try:
+        return nh3.clean(content, tags=tags, attributes=attributes)
+    except UnicodeEncodeError:
+        content = content.encode('utf-8', 'ignore').decode('utf-8')
+        return nh3.clean(content, tags=tags, attributes=attributes)
+
+
+def _clean_html(content):
+    """Strip everything but ALLOWED_HTML_TAGS and their allowed attributes"""
+    if nh3 is not None:
+        return _nh3_clean(content, _NH3_TAGS, _NH3_ATTRIBUTES)
+    return _html_cleaner().clean(content)
+
+
+def _strip_tags(text):
+    """Strip all tags, keeping the text content"""
+    if nh3 is not None:
+        return _nh3_clean(text, frozenset())
+    return _text_cleaner().clean(text)
+
+
+# bleach Cleaners hold html5lib parser state and are not thread-safe, so
+# each thread builds its own pair once instead of one per clean() call
+_cleaners = threading.local()
+
+
+def _html_cleaner():
+    """Cleaner keeping ALLOWED_HTML_TAGS, for the current thread"""
+    cleaner = getattr(_cleaners, 'html', None)
+    if cleaner is None:
+        from bleach.sanitizer import Cleaner
+        cleaner = _cleaners.html = Cleaner(
+            tags=ALLOWED_HTML_TAGS,
+            attributes=ALLOWED_HTML_ATTRIBUTES,
+            strip=True
+        )
+    return cleaner
+
+
+def _text_cleaner():
+    """Cleaner stripping all tags, for the current thread"""
+    cleaner = getattr(_cleaners, 'text', None)
+    if cleaner is None:
+        from bleach.sanitizer import Cleaner
+        cleaner = _cleaners.text = Cleaner(tags=[], strip=True)
+    return cleaner
+
+
+# Inputs up to this length are memoized; longer ones are always recomputed
+MEMOIZE_MAX_LENGTH = 256
+
+
+def _memoize_short_inputs(func):
+    """
+    lru_cache func for short string first arguments. Checks and
+    sanitizers are pure, and repeated values (retried usernames, common
+    names) are frequent; the length cap bounds the cache's memory.
+    """
+    cached = lru_cache(maxsize=8192)(func)
+    
+    @wraps(func)
+    def wrapper(value, *args, **kwargs):
+        if isinstance(value, str) and len(value) <= MEMOIZE_MAX_LENGTH:
+            return cached(value, *args, **kwargs)
+        return func(value, *args, **kwargs)
+    
+    wrapper.cache_info = cached.cache_info
+    wrapper.cache_clear = cached.cache_clear
+    return wrapper
+
+
+# Hyperscan scratch space cannot be shared between concurrent scans
+_scratch = threading.local()
+
+
+def _stop_scan(pattern_id, start, end, flags, context):
+    """Hyperscan match handler: the first match is enough"""
+    return True
+
+
+def _may_contain_injection(folded):
+    """
+    Run the Hyperscan prefilter over lowercased text. False means no
+    injection pattern can match; True means the re checks must decide.
+    """
+    try:
+        data = folded.encode('utf-8')
+    except UnicodeEncodeError:
+        # Lone surrogates are not valid UTF-8 input for the database
+        return True
+    
+    database = _get_injection_database()
+    scratch = getattr(_scratch, 'scratch', None)
+    if scratch is None:
+        scratch = _scratch.scratch = hyperscan.Scratch(database)
+    try:
+        database.scan(data, match_event_handler=_stop_scan, scratch=scratch)
+    except hyperscan.ScanTerminated:
+        return True
+    return False
+
+
+def _has_script_block(folded):
+    """
+    Whether lowercased text contains a <script ...> tag closed by
+    </script> later on the same line
+    """
+    pos = 0
+    searched_to = -1
+    while True:
+        start = folded.find('<script', pos)
+        if start == -1:
+            return False
+        tag_end = folded.find('>', start + 7)
+        if tag_end == -1:
+            return False
+        # Tags ending inside an already searched line cannot find a new close
+        if tag_end > searched_to:
+            line_end = folded.find('\n', tag_end)
+            if line_end == -1:
+                line_end = len(folded)
+            if folded.find('</script>', tag_end + 1, line_end) != -1:
+                return True
+            searched_to = line_end
+        pos = tag_end + 1
+
+
+def _has_embedded_object(folded):
+    """Whether lowercased text contains an <iframe>, <object> or <embed> tag"""
+    match = _EMBEDDED_OBJECT_RE.search(folded)
+    return match is not None and folded.find('>', match.end()) != -1
+
+
+def _scan_sqli(folded):
+    """Whether lowercased text matches a SQL injection pattern"""
+    return _SQL_RE.search(folded) is not None
+
+
+def _scan_xss(folded):
+    """Whether lowercased text matches an XSS pattern"""
+    return (
+        _XSS_RE.search(folded) is not None
+        or _has_script_block(folded)
+        or _has_embedded_object(folded)
+    )
+
+
+def _find_injection(value, check_sqli=True):
+    """
+    Return 'sql' or 'xss' for the first kind of injection pattern found
+    in value, or None
+    """
+    if value.isascii():
+        folded = value.lower()
+    else:
+        folded = value.translate(_IGNORECASE_ASCII_LETTERS).lower()
+    
+    if hyperscan is not None and not _may_contain_injection(folded):
+        return None
+    
+    # Check for potential SQL injection patterns
+    if check_sqli and _scan_sqli(folded):
+        return 'sql'
+    
+    # Check for XSS patterns
+    if _scan_xss(folded):
+        return 'xss'
+    
+    return None
+
+
+_find_injection_memoized = _memoize_short_inputs(_find_injection)
+
+
 class SecurityValidator:
     """
     Centralized security validation for user inputs
     """
     
     @staticmethod
-    def validate_user_input(value, field_name='input', max_length=1000):
+    def validate_user_input(value, field_name='input', max_length=1000, check_sqli=True):
+        """
+        Validate general user input for security issues.
+        
+        Pass check_sqli=False for values that only reach the database
+        through the ORM, which parameterizes every query; SQL patterns
+        then only matter for values interpolated into raw SQL.
+        """
+        SecurityValidator.validate_input_length(value, field_name, max_length)
+        
+        # Passwords are never kept as cache keys
+        if 'password' in field_name:
+            injection = _find_injection(value, check_sqli)
+        else:
+            injection = _find_injection_memoized(value, check_sqli)
+        
+        if injection == 'sql':
+            logger.warning(f"Potential SQL injection attempt in {field_name}: {value[:100]}")
+            raise ValidationError(f"Invalid characters in {field_name}")
+        
+        if injection == 'xss':
+            logger.warning(f"Potential XSS attempt in {field_name}: {value[:100]}")
+            raise ValidationError(f"Invalid content in {field_name}")
+        
+        return True
+    
+    @staticmethod
+    def validate_input_length(value, field_name='input', max_length=1000):
         """
-        Validate general user input for security issues
+        Type and length checks of validate_user_input, without the pattern scan
         """
         if not isinstance(value, str):
             raise ValidationError(f"Invalid {field_name} type")
@@ -37,56 +360,28 @@ class SecurityValidator:
         if len(value) > max_length:
             raise ValidationError(f"{field_name} too long (max {max_length} characters)")
         
-        # Check for potential SQL injection patterns
-        sql_patterns = [
-            r"(\bUNION\b|\bSELECT\b|\bINSERT\b|\bUPDATE\b|\bDELETE\b|\bDROP\b)",
-            r"(--|\/\*|\*\/)",
-            r"(\bOR\b\s+\d+\s*=\s*\d+|\bAND\b\s+\d+\s*=\s*\d+)",
-            r"(\bEXEC\b|\bEVAL\b|\bCHAR\b|\bCONCAT\b)"
-        ]
-        
-        for pattern in sql_patterns:
-            if re.search(pattern, value, re.IGNORECASE):
-                logger.warning(f"Potential SQL injection attempt in {field_name}: {value[:100]}")
-                raise ValidationError(f"Invalid characters in {field_name}")
-        
-        # Check for XSS patterns
-        xss_patterns = [
-            r"<script[^>]*>.*?</script>",
-            r"javascript:",
-            r"vbscript:",
-            r"onload\s*=",
-            r"onerror\s*=",
-            r"onclick\s*=",
-            r"<iframe[^>]*>",
-            r"<object[^>]*>",
-            r"<embed[^>]*>"
-        ]
-        
-        for pattern in xss_patterns:
-            if re.search(pattern, value, re.IGNORECASE):
-                logger.warning(f"Potential XSS attempt in {field_name}: {value[:100]}")
-                raise ValidationError(f"Invalid content in {field_name}")
-        
         return True
     
+    @staticmethod
+    def contains_injection(*values):
+        """
+        Whether any of values matches the SQL/XSS patterns, in one scan.
+        
+        Values are joined with NUL, so a pattern can occasionally match
+        across two values; treat True as "validate each value", not as a
+        verdict.
+        """
+        return _find_injection_memoized('\x00'.join(values)) is not None
+    
     @staticmethod
     def sanitize_html_content(content):
         """
         Sanitize HTML content to prevent XSS
         """
-        if not content:
+        if not content or not _SANITIZER_CHANGES_RE.search(content):
             return content
             
-        # Use bleach to clean HTML
-        cleaned = bleach.clean(
-            content,
-            tags=ALLOWED_HTML_TAGS,
-            attributes=ALLOWED_HTML_ATTRIBUTES,
-            strip=True
-        )
-        
-        return cleaned
+        return _clean_html(content)
     
     @staticmethod
     def validate_file_upload(file_obj, allowed_types=None, max_size_mb=10):
@@ -101,21 +396,17 @@ class SecurityValidator:
         if file_obj.size > max_size:
             raise ValidationError(f"File too large (max {max_size_mb}MB)")
         
+        # A name without a dot is checked whole against allowed_types
+        _, dot, file_extension = file_obj.name.rpartition('.')
+        file_extension = file_extension.lower()
+        
         # Check file extension if types specified
-        if allowed_types:
-            file_extension = file_obj.name.split('.')[-1].lower()
-            if file_extension not in allowed_types:
-                raise ValidationError(f"File type not allowed. Allowed: {', '.join(allowed_types)}")
+        if allowed_types and file_extension not in allowed_types:
+            raise ValidationError(f"File type not allowed. Allowed: {', '.join(allowed_types)}")
         
         # Check for suspicious file names
-        dangerous_patterns = [
-            r"\.exe$", r"\.bat$", r"\.cmd$", r"\.com$", r"\.scr$",
-            r"\.php$", r"\.asp$", r"\.jsp$", r"\.py$", r"\.pl$"
-        ]
-        
-        for pattern in dangerous_patterns:
-            if re.search(pattern, file_obj.name, re.IGNORECASE):
-                raise ValidationError("File type not allowed for security reasons")
+        if dot and file_extension in _DANGEROUS_EXTENSIONS:
+            raise ValidationError("File type not allowed for security reasons")
         
         return True
     
@@ -138,6 +429,7 @@ class InputSanitizer:
     """
     
     @staticmethod
+    @_memoize_short_inputs
     def sanitize_username(username):
         """
         Sanitize username input
@@ -145,18 +437,26 @@ class InputSanitizer:
         if not username:
             return username
             
-        # Remove any HTML/script content
-        sanitized = escape(username.strip())
-        
-        # Only allow alphanumeric, underscore, hyphen, and dot
-        sanitized = re.sub(r'[^a-zA-Z0-9._-]', '', sanitized)
+        # Only allow alphanumeric, underscore, hyphen, and dot. HTML special
+        # characters are among those removed, so no escaping is needed.
+        sanitized = _USERNAME_STRIP_RE.sub('', username.strip())
         
         # Limit length
-        sanitized = sanitized[:30]
-        
-        return sanitized
+        return sanitized[:30]
+    
+    @staticmethod
+    def sanitize_username_legacy(username):
+        """
+        sanitize_username as it was before escaping was dropped: entity
+        letters survived the strip, so "a&b" became "aampb". Accounts
+        registered back then are stored under these names.
+        """
+        if not username:
+            return username
+        return _USERNAME_STRIP_RE.sub('', escape(username.strip()))[:30]
     
     @staticmethod
+    @_memoize_short_inputs
     def sanitize_email(email):
         """
         Sanitize email input
@@ -165,13 +465,13 @@ class InputSanitizer:
             return email
             
         # Basic email format validation
-        email_pattern = r'^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$'
-        if not re.match(email_pattern, email):
+        if not _EMAIL_RE.match(email):
             raise ValidationError("Invalid email format")
         
         return escape(email.strip().lower())
     
     @staticmethod
+    @_memoize_short_inputs
     def sanitize_text_field(text, max_length=500):
         """
         Sanitize general text fields
@@ -180,7 +480,10 @@ class InputSanitizer:
             return text
             
         # Remove HTML tags but keep the text content
-        sanitized = bleach.clean(text, tags=[], strip=True)
+        if _SANITIZER_CHANGES_RE.search(text):
+            sanitized = _strip_tags(text)
+        else:
+            sanitized = text
         
         # Escape any remaining special characters
         sanitized = escape(sanitized.strip())
@@ -218,32 +521,28 @@ class CustomPasswordValidator:
         if len(password) < 8:
             errors.append("Password must be at least 8 characters long")
         
+        # Set operations run in C, so there is no per-character Python loop
+        characters = set(password)
+        
         # Must contain uppercase
-        if not re.search(r'[A-Z]', password):
+        if characters.isdisjoint(_UPPERCASE):
             errors.append("Password must contain at least one uppercase letter")
         
         # Must contain lowercase
-        if not re.search(r'[a-z]', password):
+        if characters.isdisjoint(_LOWERCASE):
             errors.append("Password must contain at least one lowercase letter")
         
-        # Must contain number
-        if not re.search(r'\d', password):
+        # Must contain number (same characters as \d)
+        if not any(map(str.isdecimal, characters)):
             errors.append("Password must contain at least one number")
         
         # Must contain special character
-        if not re.search(r'[!@#$%^&*(),.?":{}|<>]', password):
+        if characters.isdisjoint(_SPECIAL_CHARACTERS):
             errors.append("Password must contain at least one special character")
         
         # Check for common patterns
-        common_patterns = [
-            r'123456', r'password', r'qwerty', r'abc123',
-            r'admin', r'user', r'guest', r'test'
-        ]
-        
-        for pattern in common_patterns:
-            if re.search(pattern, password, re.IGNORECASE):
-                errors.append("Password contains common patterns")
-                break
+        if _COMMON_PASSWORD_RE.search(password):
+            errors.append("Password contains common patterns")
         
         if errors:
             raise ValidationError(errors)
@@ -255,51 +554,89 @@ class CustomPasswordValidator:
         )
 
 
+# Field rule type names, resolved to Python types once by compile_field_rules()
+_TYPE_MAP = {'string': str, 'int': int, 'bool': bool}
+_TYPE_NAMES = {str: 'a string', int: 'an integer', bool: 'a boolean'}
+
+
+@dataclass(slots=True, frozen=True)
+class FieldRule:
+    """
+    Compiled validation rule for a single API input field
+    """
+    required: bool = False
+    pytype: type = None
+    max_length: int = None
+    min_value: float = None
+    max_value: float = None
+    allow_html: bool = False
+    raw_sql_sink: bool = False
+
+
+def compile_field_rules(field_rules):
+    """
+    Compile a {field: {rule: value}} schema into {field: FieldRule}.
+    Call once at module load so validate_api_input() does attribute
+    access per field instead of dict probes and type-name comparisons.
+    Already-compiled rules are passed through unchanged.
+    """
+    compiled = {}
+    for field, rules in field_rules.items():
+        if isinstance(rules, FieldRule):
+            compiled[field] = rules
+            continue
+        compiled[field] = FieldRule(
+            required=bool(rules.get('required')),
+            pytype=_TYPE_MAP.get(rules.get('type')),
+            max_length=rules.get('max_length'),
+            min_value=rules.get('min_value'),
+            max_value=rules.get('max_value'),
+            allow_html=bool(rules.get('allow_html')),
+            raw_sql_sink=bool(rules.get('raw_sql_sink')),
+        )
+    return compiled
+
+
 def validate_api_input(data, field_rules=None):
     """
-    Validate API input data according to specified rules
+    Validate API input data according to specified rules. Accepts the
+    output of compile_field_rules(); raw rule dicts are compiled per call.
+    
+    Fields with rules are only scanned for SQL injection patterns when
+    marked raw_sql_sink, since ORM-bound values are parameterized. Fields
+    without rules get the full scan.
     """
     if not field_rules:
         return data
     
+    if not all(isinstance(rule, FieldRule) for rule in field_rules.values()):
+        field_rules = compile_field_rules(field_rules)
+    
     validated_data = {}
     
     for field, value in data.items():
-        if field in field_rules:
-            rules = field_rules[field]
-            
+        rule = field_rules.get(field)
+        if rule is not None:
             # Apply validation rules
-            if 'required' in rules and rules['required'] and not value:
+            if rule.required and not value:
                 raise ValidationError(f"{field} is required")
             
-            if 'type' in rules:
-                expected_type = rules['type']
-                if expected_type == 'string' and not isinstance(value, str):
-                    raise ValidationError(f"{field} must be a string")
-                elif expected_type == 'int' and not isinstance(value, int):
-                    raise ValidationError(f"{field} must be an integer")
-                elif expected_type == 'bool' and not isinstance(value, bool):
-                    raise ValidationError(f"{field} must be a boolean")
+            if rule.pytype is not None and not isinstance(value, rule.pytype):
+                raise ValidationError(f"{field} must be {_TYPE_NAMES[rule.pytype]}")
             
-            if 'max_length' in rules and isinstance(value, str):
-                max_len = rules['max_length']
-                if len(value) > max_len:
-                    raise ValidationError(f"{field} too long (max {max_len})")
-            
-            if 'min_value' in rules and isinstance(value, (int, float)):
-                min_val = rules['min_value']
-                if value < min_val:
-                    raise ValidationError(f"{field} must be at least {min_val}")
-            
-            if 'max_value' in rules and isinstance(value, (int, float)):
-                max_val = rules['max_value']
-                if value > max_val:
-                    raise ValidationError(f"{field} cannot exceed {max_val}")
+            if isinstance(value, str):
+                if rule.max_length is not None and len(value) > rule.max_length:
+                    raise ValidationError(f"{field} too long (max {rule.max_length})")
+            elif isinstance(value, (int, float)):
+                if rule.min_value is not None and value < rule.min_value:
+                    raise ValidationError(f"{field} must be at least {rule.min_value}")
+                if rule.max_value is not None and value > rule.max_value:
+                    raise ValidationError(f"{field} cannot exceed {rule.max_value}")
             
             # Sanitize the value
             if isinstance(value, str):
-                SecurityValidator.validate_user_input(value, field)
-                if 'allow_html' in rules and rules['allow_html']:
+                SecurityValidator.validate_user_input(value, field, check_sqli=rule.raw_sql_sink)
+                if rule.allow_html:
                     validated_data[field] = InputSanitizer.sanitize_rich_text(value)
                 else:
                     validated_data[field] = InputSanitizer.sanitize_text_field(value)
@@ -313,4 +650,4 @@ def validate_api_input(data, field_rules=None):
             else:
                 validated_data[field] = value
     
-    return validated_data
\ No newline at end of file
+    return validated_data
@@ -7,7 +7,7 @@ class StoryAdmin(admin.ModelAdmin):
     list_display = ('title', 'grade_level', 'difficulty', 'word_count', 'is_active', 'created_at')
     list_filter = ('grade_level', 'difficulty', 'is_active', 'created_at')
     search_fields = ('title', 'content')
-    readonly_fields = ('created_at', 'updated_at')
+    readonly_fields = ('word_count', 'estimated_reading_time', 'created_at', 'updated_at')
     
     fieldsets = (
         ('Story Information', {
@@ -1,5 +1,12 @@
+import re
 from django.db import models
 
+# Words are runs of non-whitespace
+_WORD_RE = re.compile(r'\S+')
+
+# Reading pace used for estimated_reading_time; early readers, K-5
+READING_WORDS_PER_MINUTE = 40
+
 
 class Story(models.Model):
     """
@@ -47,6 +54,20 @@ class Story(models.Model):
     
     def __str__(self):
         return f"{self.title} (Grade {self.grade_level})"
+    
+    def save(self, *args, **kwargs):
+        """Derive word count and reading time from the content once, on write"""
+        self.word_count = sum(1 for _ in _WORD_RE.finditer(self.content))
+        if self.word_count:
+            self.estimated_reading_time = max(1, self.word_count * 60 // READING_WORDS_PER_MINUTE)
+        else:
+            self.estimated_reading_time = 0
+        
+        update_fields = kwargs.get('update_fields')
+        if update_fields is not None and 'content' in update_fields:
+            kwargs['update_fields'] = {*update_fields, 'word_count', 'estimated_reading_time'}
+        
+        super().save(*args, **kwargs)
 
 
 class AudioFile(models.Model):
@@ -59,6 +80,7 @@ class AudioFile(models.Model):
         ('male_1', 'Male Voice 1'),
         ('male_2', 'Male Voice 2'),
     ]
+    VALID_VOICES = frozenset(voice for voice, _ in VOICE_CHOICES)
     
     story = models.ForeignKey(
         Story,
@@ -32,4 +32,8 @@ class StoryListSerializer(serializers.ModelSerializer):
         ]
     
     def get_audio_count(self, obj):
-        return obj.audio_files.count()
\ No newline at end of file
+        # StoryListView annotates audio_count; nested uses may not
+        audio_count = getattr(obj, 'audio_count', None)
+        if audio_count is None:
+            return obj.audio_files.count()
+        return audio_count
\ No newline at end of file
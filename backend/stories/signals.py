@@ -0,0 +1,22 @@
+"""
+Signal handlers keeping story caches in sync with the database
+"""
+
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+from performance.optimizations import invalidate_story_list_cache
+from .models import AudioFile, Story
+
+
+@receiver(post_save, sender=Story)
+@receiver(post_delete, sender=Story)
+def story_changed(sender, instance, **kwargs):
+    """Cached story lists include every active story's fields"""
+    invalidate_story_list_cache()
+
+
+@receiver(post_save, sender=AudioFile)
+@receiver(post_delete, sender=AudioFile)
+def audio_file_changed(sender, instance, **kwargs):
+    """Story lists report each story's audio count"""
+    invalidate_story_list_cache()
@@ -1,3 +1,86 @@
-from django.test import TestCase
+import shutil
+import tempfile
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+from .models import AudioFile, Story
 
-# Create your tests here.
+AUDIO_BYTES = bytes(range(256)) * 4  # 1024 bytes
+
+
+class ServeAudioRangeTests(TestCase):
+    """Byte-range handling of the audio download endpoint"""
+    
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.media_root = tempfile.mkdtemp()
+        with open(f"{cls.media_root}/fox.mp3", 'wb') as audio:
+            audio.write(AUDIO_BYTES)
+        cls.settings_override = override_settings(MEDIA_ROOT=cls.media_root, AUDIO_ACCEL_REDIRECT_PREFIX='')
+        cls.settings_override.enable()
+    
+    @classmethod
+    def tearDownClass(cls):
+        cls.settings_override.disable()
+        shutil.rmtree(cls.media_root)
+        super().tearDownClass()
+    
+    def setUp(self):
+        cache.clear()
+        user = get_user_model().objects.create_user(username='student', password='pw', user_type='student')
+        self.client.force_login(user)
+        self.story = Story.objects.create(title='The Fox', content='A fox.', grade_level='1')
+        AudioFile.objects.create(story=self.story, voice_type='female_1', file_path='fox.mp3')
+        self.url = f'/api/stories/{self.story.id}/audio/female_1/'
+    
+    def get_audio(self, byte_range=None):
+        headers = {'HTTP_RANGE': byte_range} if byte_range else {}
+        return self.client.get(self.url, **headers)
+    
+    def assertPartial(self, response, start, end):
+        self.assertEqual(response.status_code, 206)
+        self.assertEqual(response['Content-Range'], f'bytes {start}-{end}/{len(AUDIO_BYTES)}')
+        self.assertEqual(response['Content-Length'], str(end - start + 1))
+        self.assertEqual(b''.join(response.streaming_content), AUDIO_BYTES[start:end + 1])
+    
+    def test_without_range_serves_whole_file(self):
+        response = self.get_audio()
+        
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response['Accept-Ranges'], 'bytes')
+        self.assertEqual(b''.join(response.streaming_content), AUDIO_BYTES)
+    
+    def test_closed_range(self):
+        self.assertPartial(self.get_audio('bytes=10-19'), 10, 19)
+    
+    def test_open_ended_range(self):
+        self.assertPartial(self.get_audio('bytes=1000-'), 1000, 1023)
+    
+    def test_range_end_is_clamped_to_file(self):
+        self.assertPartial(self.get_audio('bytes=1000-5000'), 1000, 1023)
+    
+    def test_suffix_range(self):
+        self.assertPartial(self.get_audio('bytes=-24'), 1000, 1023)
+    
+    def test_suffix_longer_than_file(self):
+        self.assertPartial(self.get_audio('bytes=-5000'), 0, 1023)
+    
+    def test_range_past_end_is_unsatisfiable(self):
+        response = self.get_audio('bytes=1024-')
+        
+        self.assertEqual(response.status_code, 416)
+        self.assertEqual(response['Content-Range'], 'bytes */1024')
+    
+    def test_empty_suffix_is_unsatisfiable(self):
+        self.assertEqual(self.get_audio('bytes=-0').status_code, 416)
+    
+    def test_unhandled_ranges_serve_whole_file(self):
+        for byte_range in ('bytes=20-10', 'bytes=0-1,5-6', 'bytes=-', 'items=0-10'):
+            with self.subTest(byte_range=byte_range):
+                self.assertEqual(self.get_audio(byte_range).status_code, 200)
+    
+    def test_unknown_voice_is_not_found(self):
+        response = self.client.get(f'/api/stories/{self.story.id}/audio/robot/')
+        
+        self.assertEqual(response.status_code, 404)
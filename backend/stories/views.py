@@ -1,12 +1,24 @@
 from rest_framework import generics, permissions
 from rest_framework.decorators import api_view, permission_classes
 from rest_framework.response import Response
-from django.http import FileResponse, Http404
+from django.http import FileResponse, Http404, HttpResponse, StreamingHttpResponse
 from django.conf import settings
+from django.core.cache import cache
+from django.db.models import Count
+from django.utils.cache import get_conditional_response, patch_vary_headers
+from django.utils.http import content_disposition_header
+from urllib.parse import quote
+import hashlib
 import os
+import re
+from performance.optimizations import STORY_LIST_CACHE_TIMEOUT, get_story_list_version
 from .models import Story, AudioFile
 from .serializers import StorySerializer, StoryListSerializer, AudioFileSerializer
 
+# Single byte range requests, as sent by audio players when seeking
+_BYTE_RANGE_RE = re.compile(r'^bytes=(\d*)-(\d*)$')
+AUDIO_CHUNK_SIZE = 64 * 1024
+
 
 class StoryListView(generics.ListAPIView):
     """List all active stories, optionally filtered by grade level"""
@@ -14,16 +26,48 @@ class StoryListView(generics.ListAPIView):
     permission_classes = [permissions.IsAuthenticated]
     
     def get_queryset(self):
-        queryset = Story.objects.filter(is_active=True)
+        # Meta.ordering is dropped for aggregate queries; restate it, with
+        # id as a tiebreaker so pages are stable
+        queryset = Story.objects.filter(is_active=True).annotate(
+            audio_count=Count('audio_files')
+        ).order_by('grade_level', 'title', 'id')
         grade_level = self.request.query_params.get('grade_level', None)
         if grade_level:
             queryset = queryset.filter(grade_level=grade_level)
         return queryset
+    
+    def list(self, request, *args, **kwargs):
+        """
+        Serve the list from cache. The response is the same for every
+        authenticated user, so it is keyed only on the URL (grade level,
+        page) and the story list version bumped by stories.signals.
+        
+        The version only moves on save() and delete(); QuerySet.update(),
+        bulk_create() and bulk admin actions send no signals, so after them
+        the list stays stale for up to STORY_LIST_CACHE_TIMEOUT unless
+        invalidate_story_list_cache() is called.
+        """
+        version = get_story_list_version()
+        url_hash = hashlib.md5(request.build_absolute_uri().encode()).hexdigest()
+        etag = f'"{version[:16]}{url_hash[:16]}"'
+        
+        response = get_conditional_response(request, etag=etag)
+        if response is None:
+            cache_key = f"story_list_{version}_{url_hash}"
+            data = cache.get(cache_key)
+            if data is None:
+                data = super().list(request, *args, **kwargs).data
+                cache.set(cache_key, data, STORY_LIST_CACHE_TIMEOUT)
+            response = Response(data)
+        
+        response['ETag'] = etag
+        patch_vary_headers(response, ['Authorization'])
+        return response
 
 
 class StoryDetailView(generics.RetrieveAPIView):
     """Get detailed story information including audio files"""
-    queryset = Story.objects.filter(is_active=True)
+    queryset = Story.objects.filter(is_active=True).prefetch_related('audio_files')
     serializer_class = StorySerializer
     permission_classes = [permissions.IsAuthenticated]
 
@@ -32,21 +76,109 @@ class StoryDetailView(generics.RetrieveAPIView):
 @permission_classes([permissions.IsAuthenticated])
 def serve_audio(request, story_id, voice_type):
     """Serve audio files for stories"""
+    # Unknown voices cannot have a row; skip the query for bogus URLs
+    if voice_type not in AudioFile.VALID_VOICES:
+        raise Http404("Audio file not found")
+    
     try:
-        audio_file = AudioFile.objects.get(
+        # Fetch the story title for the filename in the same query
+        audio_file = AudioFile.objects.select_related('story').only(
+            'file_path', 'story__title'
+        ).get(
             story_id=story_id,
             voice_type=voice_type
         )
-        
-        file_path = os.path.join(settings.MEDIA_ROOT, audio_file.file_path)
-        
-        if not os.path.exists(file_path):
-            raise Http404("Audio file not found")
-        
-        return FileResponse(
-            open(file_path, 'rb'),
-            content_type='audio/mpeg',
-            filename=f"{audio_file.story.title}_{voice_type}.mp3"
-        )
     except AudioFile.DoesNotExist:
         raise Http404("Audio file not found")
+    
+    filename = f"{audio_file.story.title}_{voice_type}.mp3"
+    
+    if settings.AUDIO_ACCEL_REDIRECT_PREFIX:
+        # Let nginx stream the file from its internal location
+        response = HttpResponse(content_type='audio/mpeg')
+        response['Content-Disposition'] = content_disposition_header(False, filename)
+        response['X-Accel-Redirect'] = (
+            settings.AUDIO_ACCEL_REDIRECT_PREFIX.rstrip('/') + '/' +
+            quote(audio_file.file_path.lstrip('/'))
+        )
+        return response
+    
+    file_path = os.path.join(settings.MEDIA_ROOT, audio_file.file_path)
+    
+    # Open directly rather than checking existence first: one stat
+    # instead of two, and no window between the check and the open
+    try:
+        audio = open(file_path, 'rb')
+    except FileNotFoundError:
+        raise Http404("Audio file not found")
+    
+    size = os.fstat(audio.fileno()).st_size
+    byte_range = _parse_byte_range(request.headers.get('Range'), size)
+    
+    if byte_range is None:
+        response = FileResponse(
+            audio,
+            content_type='audio/mpeg',
+            filename=filename
+        )
+    elif byte_range is False:
+        audio.close()
+        response = HttpResponse(status=416)
+        response['Content-Range'] = f'bytes */{size}'
+    else:
+        start, end = byte_range
+        audio.seek(start)
+        response = StreamingHttpResponse(
+            _read_range(audio, end - start + 1),
+            status=206,
+            content_type='audio/mpeg'
+        )
+        response['Content-Length'] = str(end - start + 1)
+        response['Content-Range'] = f'bytes {start}-{end}/{size}'
+        response['Content-Disposition'] = content_disposition_header(False, filename)
+    
+    response['Accept-Ranges'] = 'bytes'
+    return response
+
+
+def _parse_byte_range(header, size):
+    """
+    Parse a Range header against a file of size bytes. Returns (start, end)
+    inclusive, False if the range cannot be satisfied, or None to serve the
+    whole file (no header, or one we do not handle such as multiple ranges).
+    """
+    if not header:
+        return None
+    match = _BYTE_RANGE_RE.match(header.strip())
+    if not match:
+        return None
+    
+    first, last = match.groups()
+    if first:
+        start = int(first)
+        if last and int(last) < start:
+            return None
+        end = min(int(last), size - 1) if last else size - 1
+    elif last:
+        # Suffix range: the final N bytes
+        if not int(last):
+            return False
+        start = max(size - int(last), 0)
+        end = size - 1
+    else:
+        return None
+    
+    if start >= size:
+        return False
+    return start, end
+
+
+def _read_range(audio, length):
+    """Yield length bytes from the current position, then close the file"""
+    with audio:
+        while length > 0:
+            chunk = audio.read(min(AUDIO_CHUNK_SIZE, length))
+            if not chunk:
+                break
+            length -= len(chunk)
+            yield chunk
@@ -74,6 +74,7 @@ export interface Recording {
   student_username: string;
   story_title: string;
   status: 'pending' | 'reviewed' | 'flagged';
+  status_display?: string;
   grade?: string;
   teacher_feedback?: string;
   duration: number | string;
@@ -104,7 +105,8 @@ export interface LoginResponse {
 }
 
 export interface ApiResponse<T> {
-  count: number;
+  // Absent from cursor-paginated lists, which don't count rows
+  count?: number;
   next: string | null;
   previous: string | null;
   results: T[];